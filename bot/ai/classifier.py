@@ -2,15 +2,31 @@
 
 from __future__ import annotations
 
-import json
 import logging
 import re
+import threading
+import time
+from collections import OrderedDict
 
+from bot.ai.jsonutil import parse_json_object
 from bot.ai.llm import run_completion
 from bot.ai.prompts import load_prompt
 
 logger = logging.getLogger("bot.ai.classifier")
 
+_INTENT_RE = re.compile(r'"intent"\s*:\s*"(\w+)"')
+
+# Repeated phrasings ("show all tickets", "summary") skip the LLM for a while.
+# Entries outlive their TTL so a failed LLM call can fall back to them. The
+# cache is per process, so a deploy with a new prompt or model starts empty.
+_CLASSIFY_TTL = 3600
+_CLASSIFY_MAX_ENTRIES = 2048
+# Messages naming a ticket are rarely repeated verbatim; caching them would
+# only push the common phrasings out.
+_TICKET_ID_RE = re.compile(r"\b[A-Za-z]{2,5}-\d+\b")
+_classify_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+_classify_lock = threading.Lock()
+
 VALID_INTENTS = {
     "my_tickets", "all_tickets", "ticket_detail", "summary",
     "stale_tickets", "update_ticket", "create_ticket", "smart_assign",
@@ -18,9 +34,33 @@ VALID_INTENTS = {
 }
 
 
+def _cache_get(key: str, allow_stale: bool = False) -> dict | None:
+    """Return a copy of the cached classification for *key*, if usable."""
+    with _classify_lock:
+        hit = _classify_cache.get(key)
+        if hit is None or (not allow_stale and hit[0] <= time.monotonic()):
+            return None
+        _classify_cache.move_to_end(key)
+    return {"intent": hit[1]["intent"], "params": dict(hit[1]["params"])}
+
+
+def _cache_put(key: str, result: dict) -> None:
+    """Store a classification, evicting the least recently used entry if full."""
+    with _classify_lock:
+        _classify_cache[key] = (time.monotonic() + _CLASSIFY_TTL, result)
+        _classify_cache.move_to_end(key)
+        if len(_classify_cache) > _CLASSIFY_MAX_ENTRIES:
+            _classify_cache.popitem(last=False)
+
+
 def classify_intent(message: str) -> dict:
     """Classify a user message into an intent with optional parameters.
 
+    Results are cached per message (whitespace-normalised) for
+    ``_CLASSIFY_TTL`` seconds, except for messages that mention a ticket ID.
+    If the LLM call fails, an expired entry for the same message is
+    returned rather than ``unknown``.
+
     Args:
         message: The raw user message text.
 
@@ -28,31 +68,33 @@ def classify_intent(message: str) -> dict:
         A dict with ``"intent"`` (str) and ``"params"`` (dict) keys.
         Falls back to ``{"intent": "unknown", "params": {}}`` on any error.
     """
+    # Case is kept in the key: params such as ticket titles are case-sensitive.
+    key = " ".join(message.split())
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
     system_prompt = load_prompt("classifier")
 
     try:
-        raw = run_completion(system_prompt, message, max_tokens=150, temperature=0.1)
+        raw = run_completion(
+            system_prompt, message,
+            max_tokens=80, temperature=0.1, grammar="intent", stop_after_json=True,
+        )
     except Exception:
         logger.exception("LLM inference failed for message: %s", message)
-        return {"intent": "unknown", "params": {}}
-
-    # Extract the first valid JSON object from the response.
-    # The LLM may produce extra text after the JSON, so use raw_decode
-    # which handles trailing content gracefully.
-    decoder = json.JSONDecoder()
-    parsed = None
-    for match in re.finditer(r"\{", raw):
-        try:
-            obj, _ = decoder.raw_decode(raw, match.start())
-            if isinstance(obj, dict):
-                parsed = obj
-                break
-        except json.JSONDecodeError:
-            continue
+        stale = _cache_get(key, allow_stale=True)
+        return stale if stale is not None else {"intent": "unknown", "params": {}}
 
+    parsed = parse_json_object(raw)
     if parsed is None:
-        logger.warning("No valid JSON found in LLM response: %s", raw)
-        return {"intent": "unknown", "params": {}}
+        # A response cut off by max_tokens still names the intent up front,
+        # and handlers already cope with missing params.
+        match = _INTENT_RE.search(raw)
+        if match is None:
+            logger.warning("No valid JSON found in LLM response: %s", raw)
+            return {"intent": "unknown", "params": {}}
+        parsed = {"intent": match.group(1), "params": {}}
 
     intent = parsed.get("intent", "unknown")
     params = parsed.get("params", {})
@@ -60,4 +102,7 @@ def classify_intent(message: str) -> dict:
     if intent not in VALID_INTENTS:
         intent = "unknown"
 
-    return {"intent": intent, "params": params if isinstance(params, dict) else {}}
+    result = {"intent": intent, "params": params if isinstance(params, dict) else {}}
+    if _TICKET_ID_RE.search(key) is None:
+        _cache_put(key, result)
+    return {"intent": intent, "params": dict(result["params"])}
@@ -0,0 +1,46 @@
+"""Parsing of JSON objects out of LLM responses."""
+
+from __future__ import annotations
+
+import json
+
+import orjson
+
+_json_decoder = json.JSONDecoder()
+
+
+def parse_json_object(raw: str) -> dict | None:
+    """Parse the JSON object in an LLM response.
+
+    The grammar-constrained output is normally a bare object, so the span
+    between the first ``{`` and the last ``}`` is tried first. Only if that
+    fails (stray braces in leading or trailing text) is each ``{`` located
+    with ``str.find`` and tried with ``raw_decode``.
+
+    Args:
+        raw: The raw completion text.
+
+    Returns:
+        The first JSON object found, or None if there is none.
+    """
+    start = raw.find("{")
+    end = raw.rfind("}")
+    if start == -1 or end < start:
+        return None
+    try:
+        obj = orjson.loads(raw[start:end + 1])
+        if isinstance(obj, dict):
+            return obj
+    except orjson.JSONDecodeError:
+        pass
+
+    pos = start
+    while pos != -1:
+        try:
+            obj, _ = _json_decoder.raw_decode(raw, pos)
+            if isinstance(obj, dict):
+                return obj
+        except json.JSONDecodeError:
+            pass
+        pos = raw.find("{", pos + 1)
+    return None
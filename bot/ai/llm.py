@@ -1,38 +1,121 @@
-"""LLM singleton and generic completion function."""
+"""LLM backends (local llama.cpp or an OpenAI-compatible server) and completion functions."""
 
 from __future__ import annotations
 
 import logging
+import threading
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
+import httpx
+import orjson
 from django.conf import settings
-from llama_cpp import Llama
+
+from bot.ai.prompts import load_grammar
+
+if TYPE_CHECKING:
+    # Imported lazily below: llama_cpp is slow to import and isn't needed at
+    # all when LLM_API_BASE points at a server, or in web/cron processes that
+    # never run a completion.
+    from llama_cpp import Llama, LlamaGrammar
 
 logger = logging.getLogger("bot.ai.llm")
 
 _llm: Llama | None = None
+_small_llm: Llama | None = None
+_load_lock = threading.Lock()
+# A llama.cpp context holds a single KV cache, so concurrent completions would
+# corrupt each other's state; Slack listener threads queue here instead.
+_inference_lock = threading.Lock()
+_small_inference_lock = threading.Lock()
+_api_client: httpx.Client | None = None
+
+
+def _load_model(model_path: str) -> Llama:
+    """Load a GGUF model with the configured context and thread settings."""
+    from llama_cpp import Llama
+
+    logger.info("Loading LLM from %s", model_path)
+    llm = Llama(
+        model_path=model_path,
+        n_ctx=settings.LLM_N_CTX,
+        n_threads=settings.LLM_N_THREADS,
+        n_gpu_layers=settings.LLM_N_GPU_LAYERS,
+        verbose=False,
+    )
+    logger.info("LLM loaded successfully")
+    return llm
 
 
 def _get_llm() -> Llama:
     """Return the singleton LLM instance, loading it on first call."""
     global _llm
     if _llm is None:
-        model_path = settings.LLM_MODEL_PATH
-        logger.info("Loading LLM from %s", model_path)
-        _llm = Llama(
-            model_path=model_path,
-            n_ctx=settings.LLM_N_CTX,
-            n_threads=settings.LLM_N_THREADS,
-            verbose=False,
-        )
-        logger.info("LLM loaded successfully")
+        with _load_lock:
+            if _llm is None:
+                _llm = _load_model(settings.LLM_MODEL_PATH)
     return _llm
 
 
+def _get_small_llm() -> Llama | None:
+    """Return the small extraction model, or ``None`` if none is configured."""
+    global _small_llm
+    if _small_llm is None and settings.LLM_SMALL_MODEL_PATH:
+        with _load_lock:
+            if _small_llm is None:
+                _small_llm = _load_model(settings.LLM_SMALL_MODEL_PATH)
+    return _small_llm
+
+
+@lru_cache(maxsize=8)
+def _get_grammar(name: str) -> LlamaGrammar:
+    """Return a parsed GBNF grammar, compiling it on first use."""
+    from llama_cpp import LlamaGrammar
+
+    return LlamaGrammar.from_string(load_grammar(name), verbose=False)
+
+
+def _read_until_json_closes(pieces: Iterable[str]) -> str:
+    """Join streamed text, stopping once the first JSON object is closed.
+
+    Braces inside string literals are ignored so values such as
+    ``"fix {x}"`` don't end the object early. If no object ever closes,
+    the whole stream is returned.
+    """
+    parts: list[str] = []
+    depth = 0
+    in_string = False
+    escaped = False
+    for piece in pieces:
+        for i, ch in enumerate(piece):
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"' and depth:
+                in_string = True
+            elif ch == "{":
+                depth += 1
+            elif ch == "}" and depth:
+                depth -= 1
+                if not depth:
+                    parts.append(piece[:i + 1])
+                    return "".join(parts)
+        parts.append(piece)
+    return "".join(parts)
+
+
 def run_completion(
     system_prompt: str,
     user_message: str,
     max_tokens: int = 150,
     temperature: float = 0.1,
+    grammar: str | None = None,
+    stop_after_json: bool = False,
 ) -> str:
     """Run a chat completion against the local LLM.
 
@@ -41,17 +124,166 @@ def run_completion(
         user_message: The user message to process.
         max_tokens: Maximum tokens in the response.
         temperature: Sampling temperature.
+        grammar: Optional name of a GBNF grammar in the prompts directory
+            (e.g. ``"intent"``) used to constrain the output.
+        stop_after_json: Stream the response and stop generating as soon as
+            the first JSON object closes, instead of running on to EOS or
+            *max_tokens*.
 
     Returns:
         The raw text content from the LLM response.
     """
-    llm = _get_llm()
-    result = llm.create_chat_completion(
-        messages=[
+    if settings.LLM_API_BASE:
+        return _complete_api(
+            settings.LLM_API_MODEL, system_prompt, user_message,
+            max_tokens, temperature, grammar, stop_after_json,
+        )
+    return _complete(
+        _get_llm(), _inference_lock, system_prompt, user_message,
+        max_tokens, temperature, grammar, stop_after_json,
+    )
+
+
+def run_completion_small(
+    system_prompt: str,
+    user_message: str,
+    max_tokens: int = 150,
+    temperature: float = 0.1,
+    grammar: str | None = None,
+    stop_after_json: bool = False,
+) -> str:
+    """Run a short, structured completion on the small extraction model.
+
+    Meant for JSON field extraction, where a smaller quantized model is as
+    accurate as the main one and decodes several times faster. Falls back
+    to the main model when ``LLM_SMALL_MODEL_PATH`` is not set.
+
+    Takes the same arguments and returns the same value as
+    :func:`run_completion`.
+    """
+    if settings.LLM_API_BASE:
+        return _complete_api(
+            settings.LLM_API_SMALL_MODEL or settings.LLM_API_MODEL, system_prompt, user_message,
+            max_tokens, temperature, grammar, stop_after_json,
+        )
+    small = _get_small_llm()
+    if small is None:
+        return run_completion(
+            system_prompt, user_message, max_tokens, temperature, grammar, stop_after_json,
+        )
+    return _complete(
+        small, _small_inference_lock, system_prompt, user_message,
+        max_tokens, temperature, grammar, stop_after_json,
+    )
+
+
+def _complete(
+    llm: Llama,
+    lock: threading.Lock,
+    system_prompt: str,
+    user_message: str,
+    max_tokens: int,
+    temperature: float,
+    grammar: str | None,
+    stop_after_json: bool,
+) -> str:
+    """Run one chat completion on *llm* while holding its inference *lock*."""
+    llama_grammar = _get_grammar(grammar) if grammar else None
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_message},
+    ]
+    with lock:
+        if stop_after_json:
+            stream = llm.create_chat_completion(
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                grammar=llama_grammar,
+                stream=True,
+            )
+            try:
+                text = _read_until_json_closes(
+                    chunk["choices"][0]["delta"].get("content") or "" for chunk in stream
+                )
+            finally:
+                stream.close()
+            return text.strip()
+
+        result = llm.create_chat_completion(
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            grammar=llama_grammar,
+        )
+    return result["choices"][0]["message"]["content"].strip()
+
+
+def _get_api_client() -> httpx.Client:
+    """Return the shared HTTP client for the OpenAI-compatible LLM server."""
+    global _api_client
+    if _api_client is None:
+        with _load_lock:
+            if _api_client is None:
+                headers = {}
+                if settings.LLM_API_KEY:
+                    headers["Authorization"] = f"Bearer {settings.LLM_API_KEY}"
+                _api_client = httpx.Client(
+                    base_url=settings.LLM_API_BASE, headers=headers, timeout=120,
+                )
+    return _api_client
+
+
+def _iter_stream_content(response: httpx.Response) -> Iterator[str]:
+    """Yield content deltas from a server-sent-events chat completion stream."""
+    for line in response.iter_lines():
+        if not line.startswith("data: "):
+            continue
+        data = line[6:]
+        if data == "[DONE]":
+            return
+        choices = orjson.loads(data).get("choices") or [{}]
+        yield choices[0].get("delta", {}).get("content") or ""
+
+
+def _complete_api(
+    model: str,
+    system_prompt: str,
+    user_message: str,
+    max_tokens: int,
+    temperature: float,
+    grammar: str | None,
+    stop_after_json: bool,
+) -> str:
+    """Run one chat completion on an OpenAI-compatible server (vLLM, TGI, llama-server).
+
+    The server batches concurrent requests itself, so no lock is taken. A
+    requested grammar is approximated with JSON mode, which every such
+    server supports. With *stop_after_json* the response is streamed and the
+    connection closed once the object is complete, which aborts generation.
+
+    Raises:
+        httpx.HTTPStatusError: If the server returns a non-2xx status.
+    """
+    payload = {
+        "model": model,
+        "messages": [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_message},
         ],
-        max_tokens=max_tokens,
-        temperature=temperature,
-    )
-    return result["choices"][0]["message"]["content"].strip()
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+    }
+    if grammar:
+        payload["response_format"] = {"type": "json_object"}
+
+    client = _get_api_client()
+    if stop_after_json:
+        payload["stream"] = True
+        with client.stream("POST", "/chat/completions", json=payload) as response:
+            response.raise_for_status()
+            return _read_until_json_closes(_iter_stream_content(response)).strip()
+
+    response = client.post("/chat/completions", json=payload)
+    response.raise_for_status()
+    return response.json()["choices"][0]["message"]["content"].strip()
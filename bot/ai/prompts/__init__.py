@@ -2,14 +2,26 @@
 
 from __future__ import annotations
 
+import re
+from functools import lru_cache
 from pathlib import Path
 
 _PROMPTS_DIR = Path(__file__).resolve().parent
 
+# ``{name}`` placeholders; JSON in few-shot examples (``{"a": ...}``, ``{}``)
+# never matches because of the quotes or the empty name.
+_PLACEHOLDER_RE = re.compile(r"\{([a-z_][a-z0-9_]*)\}")
 
+
+@lru_cache(maxsize=32)
 def load_prompt(name: str) -> str:
     """Load a prompt template from the prompts directory.
 
+    Templates are static for the lifetime of the process, so the text is
+    cached after the first read. Returning the same string on every call
+    also keeps the system-prompt prefix byte-identical, which lets
+    llama.cpp reuse its KV cache between requests.
+
     Args:
         name: Prompt file name without extension (e.g. ``"classifier"``).
 
@@ -21,3 +33,38 @@ def load_prompt(name: str) -> str:
     """
     path = _PROMPTS_DIR / f"{name}.txt"
     return path.read_text()
+
+
+def render_prompt(name: str, **values: str) -> str:
+    """Load a prompt template and fill its ``{placeholder}`` fields.
+
+    All placeholders are substituted in a single pass over the template.
+    Placeholders without a value are left as-is.
+
+    Args:
+        name: Prompt file name without extension (e.g. ``"summary"``).
+        **values: Replacement text keyed by placeholder name.
+
+    Returns:
+        The rendered prompt text.
+    """
+    return _PLACEHOLDER_RE.sub(
+        lambda m: values.get(m.group(1), m.group(0)), load_prompt(name),
+    )
+
+
+@lru_cache(maxsize=8)
+def load_grammar(name: str) -> str:
+    """Load a GBNF output grammar from the prompts directory.
+
+    Args:
+        name: Grammar file name without extension (e.g. ``"intent"``).
+
+    Returns:
+        The grammar text content.
+
+    Raises:
+        FileNotFoundError: If the grammar file does not exist.
+    """
+    path = _PROMPTS_DIR / f"{name}.gbnf"
+    return path.read_text()
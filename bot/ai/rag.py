@@ -4,21 +4,27 @@ from __future__ import annotations
 
 import json
 import logging
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import faiss
 import numpy as np
 from django.conf import settings
-from sentence_transformers import SentenceTransformer
+
+if TYPE_CHECKING:
+    # faiss and sentence_transformers (which pulls in torch) are imported on
+    # first use so processes that never search don't pay for them at startup.
+    import faiss
+    from sentence_transformers import SentenceTransformer
 
 logger = logging.getLogger("bot.ai.rag")
 
-_index: faiss.IndexFlatL2 | None = None
+_index: faiss.Index | None = None
 _metadata: list[dict] | None = None
 _embedder: SentenceTransformer | None = None
 
 
-def _load_index() -> tuple[faiss.IndexFlatL2, list[dict]]:
+def _load_index() -> tuple[faiss.Index, list[dict]]:
     """Load the FAISS index and metadata singletons."""
     global _index, _metadata
     if _index is not None and _metadata is not None:
@@ -28,8 +34,12 @@ def _load_index() -> tuple[faiss.IndexFlatL2, list[dict]]:
     index_path = index_dir / "sherpa.index"
     meta_path = index_dir / "sherpa_metadata.json"
 
+    import faiss
+
     logger.info("Loading FAISS index from %s", index_path)
     _index = faiss.read_index(str(index_path))
+    if hasattr(_index, "hnsw"):
+        _index.hnsw.efSearch = settings.RAG_HNSW_EF_SEARCH
     logger.info("FAISS index loaded — %d vectors", _index.ntotal)
 
     with open(meta_path) as f:
@@ -43,13 +53,35 @@ def _get_embedder() -> SentenceTransformer:
     """Return the singleton embedding model."""
     global _embedder
     if _embedder is None:
+        from sentence_transformers import SentenceTransformer
+
         model_name = settings.RAG_EMBEDDING_MODEL
-        logger.info("Loading embedding model: %s", model_name)
-        _embedder = SentenceTransformer(model_name)
+        backend = settings.RAG_EMBEDDING_BACKEND
+        model_kwargs = {}
+        if backend == "onnx" and settings.RAG_EMBEDDING_ONNX_FILE:
+            model_kwargs["file_name"] = settings.RAG_EMBEDDING_ONNX_FILE
+        logger.info("Loading embedding model: %s (backend=%s)", model_name, backend)
+        _embedder = SentenceTransformer(
+            model_name,
+            backend=backend,
+            model_kwargs=model_kwargs or None,
+        )
         logger.info("Embedding model loaded")
     return _embedder
 
 
+@lru_cache(maxsize=1024)
+def _encode_query(query: str) -> bytes:
+    """Embed a query and return its float32 vector as raw bytes.
+
+    Cached so repeated queries skip the embedding model entirely; bytes keep
+    the cached value immutable. Vectors are unit-normalized to match the
+    index, so inner-product and L2 indexes rank results identically.
+    """
+    query_vec = _get_embedder().encode([query], convert_to_numpy=True, normalize_embeddings=True)
+    return np.asarray(query_vec, dtype="float32").tobytes()
+
+
 def retrieve_context(query: str, top_k: int = 5) -> list[dict]:
     """Retrieve the most relevant documents for a query.
 
@@ -68,9 +100,7 @@ def retrieve_context(query: str, top_k: int = 5) -> list[dict]:
         logger.warning("FAISS index not found — RAG unavailable")
         return []
 
-    embedder = _get_embedder()
-    query_vec = embedder.encode([query])
-    query_vec = np.array(query_vec, dtype="float32")
+    query_vec = np.frombuffer(_encode_query(query), dtype="float32").reshape(1, -1)
 
     distances, indices = index.search(query_vec, top_k)
 
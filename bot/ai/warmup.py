@@ -0,0 +1,40 @@
+"""Background warm-up of the LLM, embedding model and FAISS index."""
+
+from __future__ import annotations
+
+import logging
+import threading
+
+from bot.ai.llm import run_completion
+from bot.ai.prompts import load_prompt
+from bot.ai.rag import _get_embedder, _load_index
+
+logger = logging.getLogger("bot.ai.warmup")
+
+
+def warm_up() -> None:
+    """Load the models and prime the classifier prompt's KV cache.
+
+    A one-token classification evaluates the static system prompt, so the
+    first real message only has to process its own tokens. Each step is
+    independent; a failure is logged and the rest still run.
+    """
+    try:
+        run_completion(load_prompt("classifier"), "hi", max_tokens=1, grammar="intent")
+        logger.info("LLM warm-up complete")
+    except Exception:
+        logger.exception("LLM warm-up failed")
+
+    try:
+        _load_index()
+        _get_embedder().encode(["warm up"])
+        logger.info("RAG warm-up complete")
+    except Exception:
+        logger.exception("RAG warm-up failed")
+
+
+def start_warm_up() -> threading.Thread:
+    """Run :func:`warm_up` in a daemon thread and return the thread."""
+    thread = threading.Thread(target=warm_up, name="sherpa-warmup", daemon=True)
+    thread.start()
+    return thread
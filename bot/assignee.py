@@ -2,14 +2,23 @@
 
 from __future__ import annotations
 
-import json
+import heapq
 import logging
 import re
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import itemgetter
 
-from bot.ai.llm import run_completion
+from bot.ai.jsonutil import parse_json_object
+from bot.ai.llm import run_completion_small
 
 logger = logging.getLogger("bot.assignee")
 
+# Fields of the suggestion JSON; anything else the model emits is dropped.
+_SUGGESTION_FIELDS = ("assignee", "reason", "alternative", "alt_reason")
+
 SUGGEST_ASSIGNEE_SYSTEM = """\
 You are a project-management assistant. Given a ticket and candidate project team \
 members with their similar ticket history, pick the best person to assign.
@@ -30,32 +39,37 @@ def suggest_assignee(prompt: str) -> dict:
         A dict with ``assignee``, ``reason``, ``alternative``, and ``alt_reason``.
         Falls back to empty strings on any failure.
     """
-    fallback = {"assignee": "", "reason": "", "alternative": "", "alt_reason": ""}
+    fallback = dict.fromkeys(_SUGGESTION_FIELDS, "")
 
     try:
-        raw = run_completion(SUGGEST_ASSIGNEE_SYSTEM, prompt, max_tokens=150, temperature=0.1)
+        raw = run_completion_small(
+            SUGGEST_ASSIGNEE_SYSTEM, prompt, max_tokens=150, temperature=0.1, stop_after_json=True,
+        )
     except Exception:
         logger.exception("LLM inference failed for assignee suggestion")
         return fallback
 
-    match = re.search(r"\{.*\}", raw, re.DOTALL)
-    if not match:
-        logger.warning("No JSON found in assignee suggestion response: %s", raw)
+    parsed = parse_json_object(raw)
+    if parsed is None:
+        logger.warning("No valid JSON found in assignee suggestion response: %s", raw)
         return fallback
 
-    try:
-        parsed = json.loads(match.group())
-    except json.JSONDecodeError:
-        logger.warning("Failed to parse assignee suggestion JSON: %s", raw)
-        return fallback
+    suggestion = {}
+    for field in _SUGGESTION_FIELDS:
+        value = parsed.get(field)
+        suggestion[field] = value if isinstance(value, str) else ""
+    return suggestion
+
 
-    return {
-        "assignee": parsed.get("assignee", ""),
-        "reason": parsed.get("reason", ""),
-        "alternative": parsed.get("alternative", ""),
-        "alt_reason": parsed.get("alt_reason", ""),
-    }
 
+@lru_cache(maxsize=4096)
+def _lower_intern(s: str) -> str:
+    """Return the interned lowercase form of *s*.
+
+    Project, assignee and label names repeat across every ticket, so the
+    cache turns most calls into a lookup and the results share one object.
+    """
+    return sys.intern(s.lower())
 
 
 def _extract_project_name(project) -> str:
@@ -64,8 +78,8 @@ def _extract_project_name(project) -> str:
     Handles both ``{"id": 1, "title": "X"}`` dicts and plain strings.
     """
     if isinstance(project, dict):
-        return (project.get("title") or project.get("name") or "").lower()
-    return (str(project) if project else "").lower()
+        return _lower_intern(project.get("title") or project.get("name") or "")
+    return _lower_intern(str(project) if project else "")
 
 
 def _extract_assignee_key(assignee) -> tuple[str, str]:
@@ -75,28 +89,34 @@ def _extract_assignee_key(assignee) -> tuple[str, str]:
     """
     if isinstance(assignee, dict):
         name = assignee.get("name", assignee.get("username", "Unknown"))
-        key = assignee.get("username", name).lower()
+        key = _lower_intern(assignee.get("username", name))
         return name, key
     s = str(assignee)
-    return s, s.lower()
+    return s, _lower_intern(s)
 
 
 def _extract_label_names(ticket: dict) -> set[str]:
-    """Normalize labels from a ticket into a lowercase set of label names."""
+    """Normalize labels from a ticket into a lowercase set of label names.
+
+    Names go through :func:`_lower_intern`, so the sets share string
+    objects and intersections compare by identity.
+    """
     labels = ticket.get("labels")
     if not labels:
         return set()
     if not isinstance(labels, list):
-        return {str(labels).lower()}
+        return {_lower_intern(str(labels))}
     result = set()
     for label in labels:
         if isinstance(label, dict):
-            result.add(label.get("name", str(label)).lower())
+            result.add(_lower_intern(label.get("name", str(label))))
         else:
-            result.add(str(label).lower())
+            result.add(_lower_intern(str(label)))
     return result
 
 
+_WORD_RE = re.compile(r"[a-zA-Z]{3,}")
+
 _STOPWORDS = frozenset({
     "the", "a", "an", "is", "are", "was", "were", "be", "been", "being",
     "have", "has", "had", "do", "does", "did", "will", "would", "could",
@@ -109,45 +129,97 @@ _STOPWORDS = frozenset({
 
 
 def _extract_keywords(text: str, max_keywords: int = 20) -> set[str]:
-    """Extract significant lowercase keywords from text."""
+    """Extract significant lowercase keywords from text.
+
+    Keeps the first *max_keywords* distinct non-stopwords in order of
+    appearance, in a single pass over the words.
+    """
     if not text:
         return set()
-    words = re.findall(r"[a-zA-Z]{3,}", text.lower())
-    keywords = {w for w in words if w not in _STOPWORDS}
-    if len(keywords) > max_keywords:
-        seen: set[str] = set()
-        for w in words:
-            if w not in _STOPWORDS:
-                seen.add(w)
-                if len(seen) >= max_keywords:
-                    break
-        return seen
+    keywords: set[str] = set()
+    for w in _WORD_RE.findall(text.lower()):
+        if w not in _STOPWORDS:
+            keywords.add(w)
+            if len(keywords) >= max_keywords:
+                break
     return keywords
 
 
+def _ticket_text(ticket: dict) -> str:
+    """Return the title and description of a ticket as one string."""
+    return (ticket.get("title") or "") + " " + (ticket.get("description") or "")
+
+
+@dataclass(frozen=True, slots=True)
+class TargetProfile:
+    """Normalized fields of the ticket that needs an assignee.
+
+    Built once by :func:`build_target_profile` and shared by
+    :func:`build_candidate_profiles` and :func:`build_suggestion_prompt`.
+    """
+
+    labels: frozenset[str]
+    keywords: frozenset[str]
+    project: str
+    title: str
+    description: str
+    priority: str
+
+
+def build_target_profile(ticket: dict) -> TargetProfile:
+    """Extract the labels, keywords and display fields of a target ticket."""
+    raw_priority = ticket.get("priority")
+    if isinstance(raw_priority, dict):
+        priority = raw_priority.get("name") or "unknown"
+    else:
+        priority = str(raw_priority) if raw_priority else "unknown"
+    return TargetProfile(
+        labels=frozenset(_extract_label_names(ticket)),
+        keywords=frozenset(_extract_keywords(_ticket_text(ticket))),
+        project=_extract_project_name(ticket.get("project")),
+        title=ticket.get("title", "Untitled"),
+        description=ticket.get("description") or "",
+        priority=priority,
+    )
+
+
 def _compute_ticket_similarity(
-    target_labels: set[str],
-    target_keywords: set[str],
-    other_ticket: dict,
+    target_labels: frozenset[str],
+    target_keywords: frozenset[str],
+    other_labels: set[str],
+    other_keywords: set[str],
 ) -> tuple[float, list[str]]:
-    """Compute similarity between target ticket and another ticket.
+    """Compute similarity between the target ticket and another ticket.
+
+    Takes the other ticket's pre-extracted labels and keywords so each
+    ticket is only normalized once per candidate build.
 
     Returns (score, matched_keywords_list).
     """
-    other_labels = _extract_label_names(other_ticket)
     label_score = len(target_labels & other_labels) * 2.0
 
-    other_text = (other_ticket.get("title") or "") + " " + (other_ticket.get("description") or "")
-    other_keywords = _extract_keywords(other_text)
     matched = target_keywords & other_keywords
     keyword_score = len(matched) * 1.0
 
     return label_score + keyword_score, sorted(matched)[:3]
 
 
+def _new_candidate() -> dict:
+    """Return an empty candidate profile; name and key are filled on first use."""
+    return {
+        "name": "", "key": "",
+        "project_tickets": 0, "total_tickets": 0,
+        "label_overlap": 0,
+        "similarity_score": 0.0,
+        "similar_tickets": [],
+    }
+
+
 def build_candidate_profiles(
     target_ticket: dict,
     all_tickets: list[dict],
+    profile: TargetProfile | None = None,
+    max_candidates: int | None = None,
 ) -> list[dict]:
     """Build per-assignee candidate profiles with relevance stats.
 
@@ -156,17 +228,19 @@ def build_candidate_profiles(
     Args:
         target_ticket: The ticket that needs an assignee.
         all_tickets: All tickets from the tracker.
+        profile: Pre-built profile of *target_ticket*; built here if omitted.
+        max_candidates: Return only the top N candidates; ``None`` returns all.
 
     Returns:
         A list of candidate dicts sorted by relevance_score descending.
         Each dict contains: name, key, total_tickets, project_tickets,
         label_overlap, similarity_score, similar_tickets, relevance_score.
     """
-    target_project = _extract_project_name(target_ticket.get("project"))
-    target_labels = _extract_label_names(target_ticket)
-    target_keywords = _extract_keywords(
-        (target_ticket.get("title") or "") + " " + (target_ticket.get("description") or "")
-    )
+    if profile is None:
+        profile = build_target_profile(target_ticket)
+    target_project = profile.project
+    target_labels = profile.labels
+    target_keywords = profile.keywords
 
     # Filter to same-project tickets only
     if target_project:
@@ -174,7 +248,7 @@ def build_candidate_profiles(
     else:
         tickets = all_tickets
 
-    candidates: dict[str, dict] = {}
+    candidates: defaultdict[str, dict] = defaultdict(_new_candidate)
 
     for ticket in tickets:
         assignee_list = ticket.get("assignees")
@@ -183,26 +257,24 @@ def build_candidate_profiles(
         if not isinstance(assignee_list, list):
             assignee_list = [assignee_list]
 
-        sim_score, matched_kw = _compute_ticket_similarity(target_labels, target_keywords, ticket)
+        ticket_labels = _extract_label_names(ticket)
+        ticket_keywords = _extract_keywords(_ticket_text(ticket))
+        sim_score, matched_kw = _compute_ticket_similarity(
+            target_labels, target_keywords, ticket_labels, ticket_keywords,
+        )
+        overlap = len(target_labels & ticket_labels) if target_labels and ticket_labels else 0
 
         for assignee in assignee_list:
             name, key = _extract_assignee_key(assignee)
-            if key not in candidates:
-                candidates[key] = {
-                    "name": name, "key": key,
-                    "project_tickets": 0, "total_tickets": 0,
-                    "label_overlap": 0,
-                    "similarity_score": 0.0,
-                    "similar_tickets": [],
-                }
-
             c = candidates[key]
+            if not c["total_tickets"]:
+                c["name"] = name
+                c["key"] = key
+
             c["project_tickets"] += 1
             c["total_tickets"] += 1
 
-            ticket_labels = _extract_label_names(ticket)
-            if target_labels and ticket_labels:
-                c["label_overlap"] += len(target_labels & ticket_labels)
+            c["label_overlap"] += overlap
 
             if sim_score > 0:
                 c["similarity_score"] += sim_score
@@ -215,20 +287,25 @@ def build_candidate_profiles(
 
     # Sort each candidate's similar_tickets by score, keep top 3
     for c in candidates.values():
-        c["similar_tickets"] = sorted(c["similar_tickets"], key=lambda x: x["score"], reverse=True)[:3]
+        c["similar_tickets"] = heapq.nlargest(3, c["similar_tickets"], key=itemgetter("score"))
         c["relevance_score"] = (
             c["similarity_score"] * 3.0
             + c["label_overlap"] * 2.0
             + c["total_tickets"] * 0.5
         )
 
-    return sorted(candidates.values(), key=lambda c: c["relevance_score"], reverse=True)
+    return heapq.nlargest(
+        max_candidates or len(candidates),
+        candidates.values(),
+        key=itemgetter("relevance_score"),
+    )
 
 
 def build_suggestion_prompt(
     target_ticket: dict,
     candidates: list[dict],
     max_candidates: int = 5,
+    profile: TargetProfile | None = None,
 ) -> str:
     """Build a compact LLM prompt for assignee suggestion.
 
@@ -236,18 +313,18 @@ def build_suggestion_prompt(
         target_ticket: The ticket that needs an assignee.
         candidates: Candidate profiles from build_candidate_profiles().
         max_candidates: Maximum candidates to include in the prompt.
+        profile: Pre-built profile of *target_ticket*; built here if omitted.
 
     Returns:
         A prompt string for the LLM.
     """
-    title = target_ticket.get("title", "Untitled")
-    raw_project = target_ticket.get("project", "Unknown")
-    project = _extract_project_name(raw_project) or "Unknown"
-    raw_priority = target_ticket.get("priority", "unknown")
-    priority = ((raw_priority.get("name") or "unknown") if isinstance(raw_priority, dict) else str(raw_priority)) if raw_priority else "unknown"
-    labels = _extract_label_names(target_ticket)
-    labels_str = ", ".join(sorted(labels)) if labels else "none"
-    desc = (target_ticket.get("description") or "")[:100]
+    if profile is None:
+        profile = build_target_profile(target_ticket)
+    title = profile.title
+    project = profile.project or "Unknown"
+    priority = profile.priority
+    labels_str = ", ".join(sorted(profile.labels)) if profile.labels else "none"
+    desc = profile.description[:100]
 
     lines = [
         f"Ticket: {title}",
@@ -0,0 +1,50 @@
+"""The process-wide I/O thread pool.
+
+Bolt runs Slack listeners on it, and handlers use it for fire-and-forget
+work, so there is one concurrency limit to tune (``SHERPA_LISTENER_WORKERS``).
+Nothing running on the pool may block waiting for another task on the same
+pool; use a separate executor for fan-out that is awaited.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from django.conf import settings
+
+logger = logging.getLogger("bot.background")
+
+_pool: ThreadPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the shared I/O pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=settings.SHERPA_LISTENER_WORKERS, thread_name_prefix="sherpa-io",
+                )
+                atexit.register(_pool.shutdown, wait=False)
+    return _pool
+
+
+def _log_failure(future: Future) -> None:
+    exc = future.exception()
+    if exc is not None:
+        logger.error("Background task failed", exc_info=exc)
+
+
+def run_in_background(func, *args, **kwargs) -> Future:
+    """Run ``func(*args, **kwargs)`` on the shared pool.
+
+    Exceptions are logged, since nobody waits on the returned future.
+    """
+    future = get_executor().submit(func, *args, **kwargs)
+    future.add_done_callback(_log_failure)
+    return future
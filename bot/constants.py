@@ -0,0 +1,19 @@
+"""Ticket status and priority vocabularies shared by handlers and commands."""
+
+from __future__ import annotations
+
+# Display order for help and error messages.
+VALID_STATUSES_ORDERED: tuple[str, ...] = (
+    "planning", "todo", "open", "in_progress", "in_review", "review",
+    "done", "completed", "closed", "blocked",
+)
+VALID_PRIORITIES_ORDERED: tuple[str, ...] = ("critical", "high", "medium", "low")
+
+# Membership checks.
+VALID_STATUSES: frozenset[str] = frozenset(VALID_STATUSES_ORDERED)
+VALID_PRIORITIES: frozenset[str] = frozenset(VALID_PRIORITIES_ORDERED)
+DONE_STATUSES: frozenset[str] = frozenset({"done", "completed", "closed"})
+
+# Pre-rendered lists for "Valid statuses: ..." style messages.
+VALID_STATUSES_HELP: str = ", ".join(f"`{s}`" for s in VALID_STATUSES_ORDERED)
+VALID_PRIORITIES_HELP: str = ", ".join(f"`{p}`" for p in VALID_PRIORITIES_ORDERED)
@@ -1,5 +1,9 @@
 """Handler registry — maps intent strings to handler functions."""
 
+from collections.abc import Callable, Mapping
+from types import MappingProxyType
+from typing import Final
+
 from bot.handlers.simple import (
     handle_all_tickets,
     handle_greeting,
@@ -17,7 +21,7 @@ from bot.handlers.complex import (
     handle_update_ticket,
 )
 
-HANDLER_REGISTRY: dict[str, callable] = {
+HANDLER_REGISTRY: Final[Mapping[str, Callable[..., None]]] = MappingProxyType({
     # Simple handlers (no 2nd LLM call)
     "my_tickets": handle_my_tickets,
     "all_tickets": handle_all_tickets,
@@ -32,4 +36,4 @@ HANDLER_REGISTRY: dict[str, callable] = {
     "sprint_health": handle_sprint_health,
     "sprint_retro": handle_sprint_retro,
     "eod_summary": handle_eod_summary,
-}
+})
@@ -2,14 +2,25 @@
 
 from __future__ import annotations
 
-import json
 import logging
-import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
+from operator import itemgetter
 
-from bot.ai.llm import run_completion
-from bot.ai.prompts import load_prompt
+import orjson
+
+from bot.ai.jsonutil import parse_json_object
+from bot.ai.llm import run_completion, run_completion_small
+from bot.ai.prompts import load_prompt, render_prompt
 from bot.ai.rag import retrieve_context
+from bot.constants import (
+    DONE_STATUSES,
+    VALID_PRIORITIES,
+    VALID_PRIORITIES_HELP,
+    VALID_STATUSES,
+    VALID_STATUSES_HELP,
+)
 from integrations.slack_format import (
     format_eod_summary,
     format_error_message,
@@ -28,43 +39,59 @@ from integrations.tracker import (
     get_tickets_by_date,
     get_all_tickets,
     get_stale_tickets,
+    sprint_status,
     update_ticket,
 )
 
 logger = logging.getLogger("bot.handlers.complex")
 
-VALID_STATUSES = [
-    "planning", "todo", "open", "in_progress", "in_review", "review",
-    "done", "completed", "closed", "blocked",
-]
-VALID_PRIORITIES = ["critical", "high", "medium", "low"]
 
+# Character caps for RAG context injected into the smart_assign prompt.
+_RAG_CTX_CHAR_BUDGET = 2000
+_RAG_PREVIEW_CHARS = 400
 
-_json_decoder = json.JSONDecoder()
 
+def _compact_json(data) -> str:
+    """Serialize prompt data as single-line JSON; indentation only costs tokens."""
+    return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
 
-def _extract_json(raw: str) -> dict | None:
-    """Extract the first valid JSON object from LLM output."""
-    for match in re.finditer(r"\{", raw):
-        try:
-            obj, _ = _json_decoder.raw_decode(raw, match.start())
-            if isinstance(obj, dict):
-                return obj
-        except json.JSONDecodeError:
-            continue
-    return None
+
+# (date, iso strings) for the current day; rebuilt when the date changes.
+_TODAY_CACHE: tuple[date, dict[str, str]] | None = None
 
 
-def _prepare_create_prompt() -> str:
-    """Load the create_ticket prompt and inject today's date + example deadlines."""
+def _today_strings() -> dict[str, str]:
+    """Return today's date and the standard deadlines as ISO strings.
+
+    Keys: ``today``, ``deadline_3d``, ``deadline_5d``, ``deadline_7d``,
+    ``deadline_14d``, ``deadline_friday`` and ``create_header`` (the date
+    line prepended to create_ticket messages). Built once per day.
+    """
+    global _TODAY_CACHE
     today = date.today()
-    prompt = load_prompt("create_ticket")
-    prompt = prompt.replace("{today}", today.isoformat())
-    prompt = prompt.replace("{deadline_3d}", (today + timedelta(days=3)).isoformat())
-    prompt = prompt.replace("{deadline_7d}", (today + timedelta(days=7)).isoformat())
-    prompt = prompt.replace("{deadline_14d}", (today + timedelta(days=14)).isoformat())
-    prompt = prompt.replace("{deadline_friday}", _next_weekday(today, 4).isoformat())
-    return prompt
+    if _TODAY_CACHE is None or _TODAY_CACHE[0] != today:
+        strings = {"today": today.isoformat()}
+        for days in (3, 5, 7, 14):
+            strings[f"deadline_{days}d"] = (today + timedelta(days=days)).isoformat()
+        strings["deadline_friday"] = _next_weekday(today, 4).isoformat()
+        strings["create_header"] = (
+            f"Today: {strings['today']} ({today:%A}) | "
+            f"+3d: {strings['deadline_3d']} | +5d: {strings['deadline_5d']} | "
+            f"+7d: {strings['deadline_7d']} | +14d: {strings['deadline_14d']} | "
+            f"next Friday: {strings['deadline_friday']}"
+        )
+        _TODAY_CACHE = (today, strings)
+    return _TODAY_CACHE[1]
+
+
+def _prepare_create_message(message: str) -> str:
+    """Prefix a create_ticket request with today's date and default deadlines.
+
+    The dates live in the user turn rather than the system prompt so the
+    system prompt is byte-identical across days and its KV-cache prefix can
+    be reused by llama.cpp or a prefix-caching server.
+    """
+    return f"{_today_strings()['create_header']}\n{message}"
 
 
 def _resolve_project_id(project_name: str) -> int | None:
@@ -97,22 +124,23 @@ def _next_weekday(start: date, weekday: int) -> date:
 
 def _default_deadline(priority: str) -> str:
     """Return a sensible default deadline based on priority."""
-    today = date.today()
     days = {"critical": 3, "high": 5, "medium": 7, "low": 14}.get(priority, 7)
-    return (today + timedelta(days=days)).isoformat()
+    return _today_strings()[f"deadline_{days}d"]
 
 
 def handle_create_ticket(message: str, user_id: str, params: dict, say) -> None:
     """Extract ticket fields via LLM, then create the ticket."""
-    prompt = _prepare_create_prompt()
     try:
-        raw = run_completion(prompt, message, max_tokens=200, temperature=0.1)
+        raw = run_completion_small(
+            load_prompt("create_ticket"), _prepare_create_message(message),
+            max_tokens=200, temperature=0.1, stop_after_json=True,
+        )
     except Exception:
         logger.exception("LLM failed for create_ticket")
         say(blocks=format_error_message("I had trouble understanding your ticket details. Please try again."))
         return
 
-    fields = _extract_json(raw)
+    fields = parse_json_object(raw)
     if fields is None:
         say(blocks=format_error_message("I couldn't parse the ticket details. Please try rephrasing."))
         return
@@ -166,8 +194,10 @@ def handle_update_ticket(message: str, user_id: str, params: dict, say) -> None:
     if not ticket_id or not field or not value:
         prompt = load_prompt("update_ticket")
         try:
-            raw = run_completion(prompt, message, max_tokens=100, temperature=0.1)
-            extracted = _extract_json(raw)
+            raw = run_completion_small(
+                prompt, message, max_tokens=100, temperature=0.1, stop_after_json=True,
+            )
+            extracted = parse_json_object(raw)
             if extracted:
                 ticket_id = ticket_id or extracted.get("ticket_id", "").strip()
                 field = field or extracted.get("field", "").strip().lower()
@@ -184,16 +214,14 @@ def handle_update_ticket(message: str, user_id: str, params: dict, say) -> None:
 
     # Validate based on field type
     if field == "status" and value not in VALID_STATUSES:
-        statuses = ", ".join(f"`{s}`" for s in VALID_STATUSES)
         say(blocks=format_error_message(
-            f"`{value}` is not a valid status.\nValid statuses: {statuses}"
+            f"`{value}` is not a valid status.\nValid statuses: {VALID_STATUSES_HELP}"
         ))
         return
 
     if field == "priority" and value not in VALID_PRIORITIES:
-        priorities = ", ".join(f"`{p}`" for p in VALID_PRIORITIES)
         say(blocks=format_error_message(
-            f"`{value}` is not a valid priority.\nValid priorities: {priorities}"
+            f"`{value}` is not a valid priority.\nValid priorities: {VALID_PRIORITIES_HELP}"
         ))
         return
 
@@ -203,19 +231,35 @@ def handle_update_ticket(message: str, user_id: str, params: dict, say) -> None:
     say(text=f":white_check_mark: Ticket `{ticket_id}` {field_label} updated to *{label}*.")
 
 
+def _format_rag_context(context_docs: list[dict]) -> str:
+    """Format retrieved docs as a bullet list capped at ``_RAG_CTX_CHAR_BUDGET``.
+
+    Each preview is cut to ``_RAG_PREVIEW_CHARS`` and docs stop being added
+    once the budget is spent, so one oversized preview can't inflate the
+    prompt.
+    """
+    lines: list[str] = []
+    char_total = 0
+    for doc in context_docs:
+        preview = doc.get("_text_preview") or "N/A"
+        line = f"- {preview[:_RAG_PREVIEW_CHARS]}"
+        char_total += len(line) + 1
+        if lines and char_total > _RAG_CTX_CHAR_BUDGET:
+            break
+        lines.append(line)
+    if not lines:
+        return "No similar tickets found in the knowledge base."
+    return "\n".join(lines)
+
+
 def handle_smart_assign(message: str, user_id: str, params: dict, say) -> None:
     """Recommend an assignee using RAG context from similar tickets."""
     query = params.get("query", message)
     context_docs = retrieve_context(query, top_k=5)
 
-    if context_docs:
-        context_text = "\n".join(
-            f"- {doc.get('_text_preview', 'N/A')}" for doc in context_docs
-        )
-    else:
-        context_text = "No similar tickets found in the knowledge base."
+    context_text = _format_rag_context(context_docs)
 
-    prompt = load_prompt("smart_assign").replace("{rag_context}", context_text)
+    prompt = render_prompt("smart_assign", rag_context=context_text)
 
     try:
         response = run_completion(prompt, message, max_tokens=300, temperature=0.3)
@@ -235,7 +279,7 @@ def handle_summary(message: str, user_id: str, params: dict, say) -> None:
     say(blocks=format_summary(summary_data))
 
     # Generate a natural language narrative
-    prompt = load_prompt("summary").replace("{ticket_data}", json.dumps(summary_data, indent=2))
+    prompt = render_prompt("summary", ticket_data=_compact_json(summary_data))
     try:
         narrative = run_completion(prompt, message, max_tokens=200, temperature=0.3)
         say(text=narrative)
@@ -246,9 +290,15 @@ def handle_summary(message: str, user_id: str, params: dict, say) -> None:
 
 def handle_sprint_health(message: str, user_id: str, params: dict, say) -> None:
     """Analyze sprint health using ticket data + stale tickets."""
-    summary_data = get_ticket_summary()
-    stale_data = get_stale_tickets(days=3)
-    all_tickets = get_all_tickets()
+    # The three tracker calls are independent; run them concurrently so the
+    # handler waits for the slowest one rather than their sum.
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        summary_future = pool.submit(get_ticket_summary)
+        stale_future = pool.submit(get_stale_tickets, days=3)
+        all_future = pool.submit(get_all_tickets)
+        summary_data = summary_future.result()
+        stale_data = stale_future.result()
+        all_tickets = all_future.result()
 
     sprint_info = {
         "summary": summary_data,
@@ -260,7 +310,7 @@ def handle_sprint_health(message: str, user_id: str, params: dict, say) -> None:
         ],
     }
 
-    prompt = load_prompt("sprint_health").replace("{sprint_data}", json.dumps(sprint_info, indent=2))
+    prompt = render_prompt("sprint_health", sprint_data=_compact_json(sprint_info))
 
     try:
         analysis = run_completion(prompt, message, max_tokens=400, temperature=0.3)
@@ -290,7 +340,9 @@ def handle_eod_summary(message: str, user_id: str, params: dict, say) -> None:
     say(blocks=format_eod_summary(target_date, tickets))
 
 
-DONE_STATUSES = {"done", "completed", "closed"}
+def _sprint_end_date(sprint: dict) -> str:
+    """Sort key for sprints; ISO end dates compare correctly as strings."""
+    return sprint.get("end_date", "")
 
 
 def _resolve_sprint(params: dict) -> dict | None:
@@ -318,12 +370,12 @@ def _resolve_sprint(params: dict) -> dict | None:
                 return s
 
     # Default: most recently completed sprint, or the latest sprint overall
-    completed = [s for s in sprints if (s.get("status") or "").lower() in ("completed", "closed", "done")]
+    completed = [s for s in sprints if sprint_status(s) in DONE_STATUSES]
     if completed:
-        return sorted(completed, key=lambda s: s.get("end_date", ""), reverse=True)[0]
+        return max(completed, key=_sprint_end_date)
 
     # Fallback to the latest sprint by end_date
-    return sorted(sprints, key=lambda s: s.get("end_date", ""), reverse=True)[0]
+    return max(sprints, key=_sprint_end_date)
 
 
 def _compute_sprint_stats(tickets: list[dict]) -> tuple[dict, list[dict]]:
@@ -336,13 +388,13 @@ def _compute_sprint_stats(tickets: list[dict]) -> tuple[dict, list[dict]]:
     completed = 0
     points_completed = 0
     points_total = 0
-    status_counts: dict[str, int] = {}
+    status_counts: Counter[str] = Counter()
     member_map: dict[str, dict] = {}
     unassigned = 0
 
     for t in tickets:
         status = t.get("status", "unknown")
-        status_counts[status] = status_counts.get(status, 0) + 1
+        status_counts[status] += 1
         sp = t.get("story_points") or 0
         points_total += sp
 
@@ -361,12 +413,13 @@ def _compute_sprint_stats(tickets: list[dict]) -> tuple[dict, list[dict]]:
                     name = a.get("name") or a.get("username") or "Unknown"
                 else:
                     name = str(a)
-                if name not in member_map:
-                    member_map[name] = {"name": name, "completed": 0, "total": 0, "points": 0}
-                member_map[name]["total"] += 1
+                member = member_map.get(name)
+                if member is None:
+                    member = member_map[name] = {"name": name, "completed": 0, "total": 0, "points": 0}
+                member["total"] += 1
                 if is_done:
-                    member_map[name]["completed"] += 1
-                    member_map[name]["points"] += sp
+                    member["completed"] += 1
+                    member["points"] += sp
 
     missed = total - completed
     rate = round(completed / total * 100) if total > 0 else 0
@@ -378,11 +431,11 @@ def _compute_sprint_stats(tickets: list[dict]) -> tuple[dict, list[dict]]:
         "points_completed": points_completed,
         "points_total": points_total,
         "completion_rate": rate,
-        "status_counts": status_counts,
+        "status_counts": dict(status_counts),
         "unassigned_count": unassigned,
     }
 
-    member_stats = sorted(member_map.values(), key=lambda m: m["completed"], reverse=True)
+    member_stats = sorted(member_map.values(), key=itemgetter("completed"), reverse=True)
     return stats, member_stats
 
 
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 
+from bot.background import run_in_background
 from integrations.slack_format import (
     format_error_message,
     format_no_tickets,
@@ -18,15 +19,11 @@ from integrations.tracker import (
     get_ticket_detail,
     get_ticket_summary,
     get_tickets_for_user,
+    prefetch_user_data,
 )
 
 logger = logging.getLogger("bot.handlers.simple")
 
-VALID_STATUSES = [
-    "planning", "todo", "open", "in_progress", "in_review", "review",
-    "done", "completed", "closed", "blocked",
-]
-
 HELP_TEXT = (
     ":robot_face: *Hi, I'm Sherpa!* Here's what I can help with:\n\n"
     "- *My tickets* \u2014 \"what tickets are assigned to me?\"\n"
@@ -83,4 +80,6 @@ def handle_stale_tickets(message: str, user_id: str, params: dict, say) -> None:
 
 
 def handle_greeting(message: str, user_id: str, params: dict, say) -> None:
+    # A greeting is usually followed by "my tickets" or "summary"; warm those.
+    run_in_background(prefetch_user_data, user_id)
     say(text=f":wave: Hey there! How can I help you today?\n\n{HELP_TEXT}")
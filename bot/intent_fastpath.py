@@ -0,0 +1,95 @@
+"""Regex fast path for common, unambiguous phrasings.
+
+Messages like "help", "my tickets", "show BZ-42" or "mark BZ-10 as done"
+don't need the LLM classifier. Each pattern must match the *whole* message,
+so anything with extra qualifiers ("my tickets in the Arbok project") still
+goes through ``classify_intent``.
+"""
+
+from __future__ import annotations
+
+import re
+
+from bot.constants import VALID_STATUSES
+
+_TICKET_ID = r"(?P<ticket_id>[A-Za-z]{2,5}-\d+)"
+# Without a "ticket"/"details" keyword, only an upper-case key counts as an
+# ID, so "covid-19" or "show covid-19" still go to the classifier.
+_BARE_TICKET_ID = r"(?P<ticket_id>(?-i:[A-Z]{2,5})-\d+)"
+_END = r"\s*[?!.]*"
+
+# (pattern, intent) — tried in order; the first full match wins.
+_PATTERNS: tuple[tuple[re.Pattern[str], str], ...] = tuple(
+    (re.compile(f"(?:{pattern}){_END}", re.IGNORECASE), intent)
+    for pattern, intent in (
+        # "help" gets the greeting reply, which is the help text.
+        (r"(?:hii*|hello|hey|hiya|yo|good (?:morning|afternoon|evening))(?: sherpa)?|help", "greeting"),
+        (
+            r"(?:(?:show|list|get)(?: me)? )?my (?:tickets|tasks)"
+            r"|what (?:tickets|tasks) (?:are|do i have) assigned to me"
+            r"|what am i working on",
+            "my_tickets",
+        ),
+        (r"(?:(?:show|list|get)(?: me)? )?all(?: the)? tickets", "all_tickets"),
+        (r"(?:(?:give|show) me )?(?:a |the )?(?:ticket )?(?:summary|overview)", "summary"),
+        (
+            r"(?:(?:show|get)(?: me)? )?(?:(?:the )?(?:details?|info)(?: (?:for|of|on|about))? (?:ticket )?|ticket )"
+            + _TICKET_ID,
+            "ticket_detail",
+        ),
+        (
+            r"(?:(?:show|get)(?: me)? )?" + _BARE_TICKET_ID + r"(?: (?:details?|info))?",
+            "ticket_detail",
+        ),
+        (
+            r"(?:(?:show|list|any)(?: me)? )?stale(?: tickets)?"
+            r"(?: (?:(?:in|from|for) the (?:last|past) |older than )?(?P<days>\d+)(?: days?)?)?",
+            "stale_tickets",
+        ),
+        (
+            r"mark (?:ticket )?" + _TICKET_ID + r" as (?P<status>[a-z]+(?:[ _][a-z]+)?)",
+            "update_ticket",
+        ),
+        (r"(?:how(?:'s| is) the sprint(?: going)?|sprint (?:health|status))", "sprint_health"),
+        (r"(?:(?:show|give)(?: me)? )?(?:the )?(?:eod(?: summary)?|daily report)", "eod_summary"),
+        (r"(?:the )?(?:last )?sprint retro(?:spective)?|retro(?:spective)?", "sprint_retro"),
+    )
+)
+
+
+def match_intent(message: str) -> dict | None:
+    """Return a classification for *message* if a fast-path pattern fits.
+
+    Args:
+        message: The cleaned user message text.
+
+    Returns:
+        A dict shaped like :func:`bot.ai.classifier.classify_intent`'s
+        result, or None if the message should go to the LLM classifier.
+    """
+    text = message.strip()
+    for pattern, intent in _PATTERNS:
+        match = pattern.fullmatch(text)
+        if match is None:
+            continue
+
+        groups = match.groupdict()
+        if intent == "ticket_detail":
+            return {"intent": intent, "params": {"ticket_id": groups["ticket_id"].upper()}}
+        if intent == "stale_tickets":
+            params = {"days": int(groups["days"])} if groups.get("days") else {}
+            return {"intent": intent, "params": params}
+        if intent == "update_ticket":
+            status = groups["status"].lower().replace(" ", "_")
+            if status not in VALID_STATUSES:
+                return None
+            return {
+                "intent": intent,
+                "params": {
+                    "ticket_id": groups["ticket_id"].upper(),
+                    "field": "status",
+                    "value": status,
+                },
+            }
+        return {"intent": intent, "params": {}}
+    return None
@@ -5,18 +5,41 @@ Run via system cron at 6 PM UTC, weekdays only:
 """
 
 import logging
+from concurrent.futures import as_completed
 from datetime import date
+from itertools import groupby
+from operator import itemgetter
 
 from django.conf import settings
 from django.core.cache import cache
 from django.core.management.base import BaseCommand
-from slack_sdk import WebClient
 
+from integrations import slack_sender
 from integrations.slack_format import format_eod_summary
 from integrations.tracker import get_tickets_by_date
 
 logger = logging.getLogger("bot.management.auto_eod")
 
+# A "pending" key is claimed with cache.add() before posting, so overlapping
+# runs can't both send; it is swapped for the long-lived sent key afterwards.
+# The sent key is checked again once the claim succeeds, in case another run
+# finished in between.
+_PENDING_TTL = 300
+
+_ACTIONABLE_STATUSES = frozenset(
+    {"done", "completed", "closed", "in_progress", "in_review", "review", "blocked"}
+)
+
+
+def _project_name(ticket: dict) -> str:
+    """Return the ticket's project name, or "" if it has none."""
+    proj = ticket.get("project")
+    if isinstance(proj, dict):
+        return proj.get("title") or proj.get("name") or ""
+    if isinstance(proj, str):
+        return proj
+    return ""
+
 
 class Command(BaseCommand):
     help = "Post the daily EOD summary to Slack (one message per project)."
@@ -35,25 +58,16 @@ class Command(BaseCommand):
             self.stdout.write(f"No ticket activity for {today} — skipping.")
             return
 
-        ACTIONABLE = {"done", "completed", "closed", "in_progress", "in_review", "review", "blocked"}
-
-        # Group tickets by project — skip unassigned
-        projects: dict[str, list[dict]] = {}
-        for t in tickets:
-            proj = t.get("project")
-            if isinstance(proj, dict):
-                proj_name = proj.get("title") or proj.get("name") or ""
-            elif isinstance(proj, str):
-                proj_name = proj
-            else:
-                proj_name = ""
-            if not proj_name:
-                continue
-            projects.setdefault(proj_name, []).append(t)
+        # Group tickets by project — skip unassigned. The sort is stable, so
+        # tickets keep their tracker order within each project.
+        flat = [(name, t) for t in tickets if (name := _project_name(t))]
+        flat.sort(key=itemgetter(0))
 
-        client = WebClient(token=settings.SLACK_BOT_TOKEN)
+        project_channels = settings.PROJECT_SLACK_CHANNELS
+        fallback_channel = settings.RETRO_SLACK_CHANNEL
 
-        for proj_name in sorted(projects):
+        futures = {}
+        for proj_name, group in groupby(flat, key=itemgetter(0)):
             safe_name = proj_name.replace(" ", "_")
             cache_key = f"eod_sent_{today}_{safe_name}"
 
@@ -61,28 +75,40 @@ class Command(BaseCommand):
                 self.stdout.write(f"EOD already sent for {today}/{proj_name} — skipping.")
                 continue
 
-            proj_tickets = projects[proj_name]
+            proj_tickets = [t for _, t in group]
 
             # Skip projects with nothing actionable to show
-            if not any(t.get("status") in ACTIONABLE for t in proj_tickets):
+            if _ACTIONABLE_STATUSES.isdisjoint(t.get("status") for t in proj_tickets):
                 self.stdout.write(f"No updates for {today}/{proj_name} — skipping.")
                 continue
 
+            pending_key = f"{cache_key}:pending"
+            if not cache.add(pending_key, True, timeout=_PENDING_TTL):
+                self.stdout.write(f"EOD for {today}/{proj_name} is already being sent — skipping.")
+                continue
+            if cache.get(cache_key):
+                cache.delete(pending_key)
+                self.stdout.write(f"EOD already sent for {today}/{proj_name} — skipping.")
+                continue
+
             blocks = format_eod_summary(today, proj_tickets, project_name=proj_name)
-            channel = settings.PROJECT_SLACK_CHANNELS.get(
-                proj_name, settings.RETRO_SLACK_CHANNEL,
+            channel = project_channels.get(proj_name, fallback_channel)
+
+            future = slack_sender.post(
+                channel, blocks=blocks, text=f"EOD Summary — {proj_name} — {today}",
             )
+            futures[future] = (proj_name, channel, cache_key, pending_key)
 
+        for future in as_completed(futures):
+            proj_name, channel, cache_key, pending_key = futures[future]
             try:
-                client.chat_postMessage(
-                    channel=channel,
-                    blocks=blocks,
-                    text=f"EOD Summary — {proj_name} — {today}",
-                )
+                future.result()
                 self.stdout.write(f"Posted EOD summary for {today}/{proj_name} → {channel}")
             except Exception:
                 logger.exception("Failed to post EOD summary for %s/%s", today, proj_name)
                 self.stderr.write(f"ERROR: Failed to post EOD summary for {today}/{proj_name}.")
+                cache.delete(pending_key)
                 continue
 
             cache.set(cache_key, True, timeout=86400)
+            cache.delete(pending_key)
@@ -9,14 +9,18 @@ import logging
 from django.conf import settings
 from django.core.cache import cache
 from django.core.management.base import BaseCommand
-from slack_sdk import WebClient
 
-from bot.handlers.complex import DONE_STATUSES, _compute_sprint_stats
+from bot.constants import DONE_STATUSES
+from bot.handlers.complex import _compute_sprint_stats, _sprint_end_date
+from integrations.slack_client import get_slack_client
 from integrations.slack_format import format_sprint_retro
-from integrations.tracker import get_sprint_tickets, get_sprints
+from integrations.tracker import get_sprint_tickets, get_sprints, sprint_status
 
 logger = logging.getLogger("bot.management.auto_retro")
 
+# How long an in-flight retro post blocks an overlapping run.
+_PENDING_TTL = 300
+
 
 class Command(BaseCommand):
     help = "Post a sprint retro to Slack for the latest completed sprint."
@@ -29,17 +33,14 @@ class Command(BaseCommand):
             self.stderr.write("ERROR: Could not fetch sprints from tracker.")
             return
 
-        completed = [
-            s for s in sprints
-            if (s.get("status") or "").lower() in DONE_STATUSES
-        ]
+        completed = [s for s in sprints if sprint_status(s) in DONE_STATUSES]
 
         if not completed:
             self.stdout.write("No completed sprints found.")
             return
 
         # Only process the most recently completed sprint
-        sprint = sorted(completed, key=lambda s: s.get("end_date", ""), reverse=True)[0]
+        sprint = max(completed, key=_sprint_end_date)
         sprint_id = sprint.get("id")
         sprint_name = sprint.get("name", "Unknown")
         cache_key = f"retro_sent_{sprint_id}"
@@ -63,7 +64,17 @@ class Command(BaseCommand):
         stats, member_stats = _compute_sprint_stats(tickets)
         blocks = format_sprint_retro(sprint, stats, member_stats, tickets)
 
-        client = WebClient(token=settings.SLACK_BOT_TOKEN)
+        pending_key = f"{cache_key}:pending"
+        if not cache.add(pending_key, True, timeout=_PENDING_TTL):
+            self.stdout.write(f"Retro for {sprint_name} is already being sent — skipping.")
+            return
+        # Another run may have finished between the first check and the claim.
+        if cache.get(cache_key):
+            cache.delete(pending_key)
+            self.stdout.write(f"Retro already sent for {sprint_name} — skipping.")
+            return
+
+        client = get_slack_client()
         channel = settings.RETRO_SLACK_CHANNEL
 
         try:
@@ -76,6 +87,8 @@ class Command(BaseCommand):
         except Exception:
             logger.exception("Failed to post retro for sprint %s", sprint_name)
             self.stderr.write(f"ERROR: Failed to post retro for {sprint_name}.")
+            cache.delete(pending_key)
             return
 
         cache.set(cache_key, True, timeout=None)
+        cache.delete(pending_key)
@@ -5,38 +5,38 @@ Run via system cron at 5 PM UTC, weekdays only:
 """
 
 import logging
+from concurrent.futures import as_completed
 
-from django.conf import settings
+from django.core.cache import cache
 from django.core.management.base import BaseCommand
-from slack_sdk import WebClient
 
+from bot.constants import DONE_STATUSES
+from integrations import slack_sender
 from integrations.slack_format import format_eod_reminder_dm
-from integrations.tracker import get_slack_mappings, get_sprint_tickets, get_sprints
+from integrations.tracker import get_active_sprint_with_tickets, get_slack_mappings
 
 logger = logging.getLogger("bot.management.eod_reminder")
 
-DONE_STATUSES = {"done", "completed", "closed"}
+# Mappings change rarely; reuse them across cron runs for a while.
+_SLACK_MAP_CACHE_KEY = "slack_mappings"
+_SLACK_MAP_TTL = 600
 
 
 class Command(BaseCommand):
     help = "DM each developer with active sprint tickets reminding them to update before EOD."
 
     def handle(self, *args, **options):
-        sprints = get_sprints()
-        active_sprint = next((s for s in sprints if s.get("status") == "active"), None)
+        active_sprint, active = get_active_sprint_with_tickets(exclude_statuses=DONE_STATUSES)
         if not active_sprint:
             self.stdout.write("No active sprint — skipping.")
             return
 
-        sprint_tickets = get_sprint_tickets(active_sprint["id"])
-        active = [t for t in sprint_tickets if t.get("status") not in DONE_STATUSES]
-
         if not active:
             self.stdout.write("No active tickets in sprint — skipping.")
             return
 
         # Fetch username → slack_user_id mappings
-        slack_map = get_slack_mappings()
+        slack_map = cache.get_or_set(_SLACK_MAP_CACHE_KEY, get_slack_mappings, timeout=_SLACK_MAP_TTL)
 
         # Group tickets by assignee slack_user_id
         by_dev: dict[str, list[dict]] = {}
@@ -54,9 +54,7 @@ class Command(BaseCommand):
             self.stdout.write("No assignees with Slack mapping — skipping.")
             return
 
-        client = WebClient(token=settings.SLACK_BOT_TOKEN)
-        reminded = 0
-
+        futures = {}
         for slack_user_id, tickets in by_dev.items():
             dev_name = dev_names.get(slack_user_id, "there")
             narrative = (
@@ -66,8 +64,14 @@ class Command(BaseCommand):
             )
 
             blocks = format_eod_reminder_dm(narrative, tickets)
+            future = slack_sender.post(slack_user_id, blocks=blocks, text=narrative)
+            futures[future] = (slack_user_id, dev_name, tickets)
+
+        reminded = 0
+        for future in as_completed(futures):
+            slack_user_id, dev_name, tickets = futures[future]
             try:
-                client.chat_postMessage(channel=slack_user_id, blocks=blocks, text=narrative)
+                future.result()
                 reminded += 1
                 self.stdout.write(f"Sent DM to {slack_user_id}/{dev_name} ({len(tickets)} tickets)")
             except Exception:
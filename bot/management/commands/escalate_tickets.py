@@ -5,19 +5,32 @@ Run via system cron at 10 AM UTC, weekdays only:
 """
 
 import logging
+from concurrent.futures import as_completed
 from datetime import datetime, timedelta, timezone
 
+import orjson
 from django.conf import settings
 from django.core.cache import cache
 from django.core.management.base import BaseCommand
-from slack_sdk import WebClient
 
+from integrations import slack_sender
 from integrations.slack_format import format_risk_escalation_dm
-from integrations.tracker import get_sprint_tickets, get_sprints
+from integrations.tracker import get_active_sprint_with_tickets
 
 logger = logging.getLogger("bot.management.escalate_tickets")
 
-DONE_STATUSES = {"done", "completed", "closed"}
+# Held (via cache.add) while PMs are being messaged, so an overlapping run skips.
+_PENDING_TTL = 300
+_PENDING_KEY = "escalate:pending"
+
+# Only unstarted and in-progress tickets can be escalated.
+_ESCALATED_STATUSES = frozenset({"todo", "in_progress"})
+
+
+def _not_yet_escalated(tickets: list[dict]) -> list[dict]:
+    """Return the tickets without an ``escalate:<id>`` marker (one round-trip)."""
+    escalated = cache.get_many([f"escalate:{t['id']}" for t in tickets])
+    return [t for t in tickets if not escalated.get(f"escalate:{t['id']}")]
 
 
 class Command(BaseCommand):
@@ -29,72 +42,69 @@ class Command(BaseCommand):
             self.stdout.write("ESCALATION_PM_SLACK_IDS not configured — skipping.")
             return
 
-        sprints = get_sprints()
-        active_sprint = next((s for s in sprints if s.get("status") == "active"), None)
+        active_sprint, sprint_tickets = get_active_sprint_with_tickets(
+            statuses=_ESCALATED_STATUSES,
+        )
         if not active_sprint:
             self.stdout.write("No active sprint — skipping.")
             return
 
-        sprint_tickets = get_sprint_tickets(active_sprint["id"])
-        threshold = datetime.now(timezone.utc) - timedelta(days=settings.RISK_STALE_DAYS)
+        now_utc = datetime.now(timezone.utc)
+        threshold = now_utc - timedelta(days=settings.RISK_STALE_DAYS)
 
         at_risk: list[dict] = []
+        # sprint_tickets only holds _ESCALATED_STATUSES, so todo and
+        # in_progress tickets share one staleness check.
         for t in sprint_tickets:
-            status = t.get("status", "")
-            if status in DONE_STATUSES:
+            updated_at = t.get("updated_at", "") or ""
+            if not updated_at:
+                continue
+            try:
+                updated_dt = datetime.fromisoformat(updated_at.replace("Z", "+00:00"))
+            except (ValueError, TypeError):
                 continue
+            if updated_dt < threshold:
+                t["days_since_update"] = (now_utc - updated_dt).days
+                at_risk.append(t)
 
-            if status == "todo":
-                updated_at = t.get("updated_at", "") or ""
-                if updated_at:
-                    try:
-                        updated_dt = datetime.fromisoformat(updated_at.replace("Z", "+00:00"))
-                        if updated_dt < threshold:
-                            t["days_since_update"] = (datetime.now(timezone.utc) - updated_dt).days
-                            at_risk.append(t)
-                    except (ValueError, TypeError):
-                        pass
-            elif status == "in_progress":
-                updated_at = t.get("updated_at", "") or ""
-                if updated_at:
-                    try:
-                        updated_dt = datetime.fromisoformat(updated_at.replace("Z", "+00:00"))
-                        if updated_dt < threshold:
-                            t["days_since_update"] = (datetime.now(timezone.utc) - updated_dt).days
-                            at_risk.append(t)
-                    except (ValueError, TypeError):
-                        pass
-
-        # Deduplicate by ticket ID
-        seen_ids: set[str] = set()
-        unique_at_risk: list[dict] = []
+        # Deduplicate by ticket ID, keeping the first occurrence of each
+        by_id: dict = {}
         for t in at_risk:
-            tid = t.get("id", "")
-            if tid and tid not in seen_ids:
-                seen_ids.add(tid)
-                unique_at_risk.append(t)
-
-        # Filter out already-escalated tickets via cache
-        new_at_risk: list[dict] = []
-        for t in unique_at_risk:
-            cache_key = f"escalate:{t.get('id', '')}"
-            if not cache.get(cache_key):
-                new_at_risk.append(t)
+            if t.get("id"):
+                by_id.setdefault(t["id"], t)
+        unique_at_risk = list(by_id.values())
+
+        if not _not_yet_escalated(unique_at_risk):
+            self.stdout.write("No new at-risk tickets — skipping.")
+            return
+
+        if not cache.add(_PENDING_KEY, True, timeout=_PENDING_TTL):
+            self.stdout.write("Escalation is already being sent — skipping.")
+            return
 
+        # Filter again under the claim: a run that finished after the check
+        # above has already marked its tickets as escalated.
+        new_at_risk = _not_yet_escalated(unique_at_risk)
         if not new_at_risk:
+            cache.delete(_PENDING_KEY)
             self.stdout.write("No new at-risk tickets — skipping.")
             return
 
         todo = [t for t in new_at_risk if t.get("status") == "todo"]
         stale = [t for t in new_at_risk if t.get("status") == "in_progress"]
 
-        blocks = format_risk_escalation_dm(todo, stale)
+        # Every PM gets the same payload, so encode the blocks once.
+        blocks = orjson.dumps(format_risk_escalation_dm(todo, stale)).decode()
         fallback = f"{len(new_at_risk)} at-risk ticket(s) in the current sprint need attention."
 
-        client = WebClient(token=settings.SLACK_BOT_TOKEN)
-        for pm_slack_id in pm_slack_ids:
+        futures = {
+            slack_sender.post(pm_slack_id, blocks=blocks, text=fallback): pm_slack_id
+            for pm_slack_id in pm_slack_ids
+        }
+        for future in as_completed(futures):
+            pm_slack_id = futures[future]
             try:
-                client.chat_postMessage(channel=pm_slack_id, blocks=blocks, text=fallback)
+                future.result()
                 self.stdout.write(f"Sent escalation to {pm_slack_id}")
             except Exception:
                 logger.exception("Failed to send escalation to %s", pm_slack_id)
@@ -102,7 +112,7 @@ class Command(BaseCommand):
 
         # Set cache keys to prevent re-escalation (TTL = 20 hours)
         cache_ttl = 20 * 60 * 60
-        for t in new_at_risk:
-            cache.set(f"escalate:{t.get('id', '')}", True, timeout=cache_ttl)
+        cache.set_many({f"escalate:{t['id']}": True for t in new_at_risk}, timeout=cache_ttl)
+        cache.delete(_PENDING_KEY)
 
         self.stdout.write(f"Done — escalated {len(new_at_risk)} ticket(s) to {len(pm_slack_ids)} PM(s).")
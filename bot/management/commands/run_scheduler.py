@@ -0,0 +1,60 @@
+"""Management command to run the scheduled jobs in one long-lived process.
+
+Replaces the per-job system cron entries, so Django, the tracker HTTP client
+and the Slack client stay warm between runs:
+    python3 manage.py run_scheduler
+
+Each job is still an ordinary management command and can be run on its own.
+"""
+
+import logging
+import time
+from datetime import datetime, timezone
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+logger = logging.getLogger("bot.management.run_scheduler")
+
+_WEEKDAYS = frozenset(range(5))
+_EVERY_DAY = frozenset(range(7))
+
+# (command, hours (UTC), weekdays) — each job runs at minute 0 of the listed hours.
+SCHEDULE: tuple[tuple[str, frozenset[int], frozenset[int]], ...] = (
+    ("escalate_tickets", frozenset({10}), _WEEKDAYS),
+    ("eod_reminder", frozenset({17}), _WEEKDAYS),
+    ("auto_eod", frozenset({18}), _WEEKDAYS),
+    ("auto_retro", frozenset({0, 6, 12, 18}), _EVERY_DAY),
+)
+
+
+def _due_jobs(now: datetime) -> list[str]:
+    """Return the commands scheduled for the minute containing *now*."""
+    if now.minute != 0:
+        return []
+    return [
+        name for name, hours, days in SCHEDULE
+        if now.hour in hours and now.weekday() in days
+    ]
+
+
+class Command(BaseCommand):
+    help = "Run the EOD, reminder, escalation and retro jobs on their schedule in one process."
+
+    def handle(self, *args, **options):
+        self.stdout.write("Scheduler started — " + ", ".join(name for name, _, _ in SCHEDULE))
+
+        while True:
+            # Sleep to the start of the next minute, then run whatever is due.
+            time.sleep(60 - time.time() % 60)
+            now = datetime.now(timezone.utc)
+
+            for name in _due_jobs(now):
+                close_old_connections()
+                logger.info("Running %s", name)
+                try:
+                    call_command(name)
+                except Exception:
+                    logger.exception("Scheduled job %s failed", name)
+                    self.stderr.write(f"ERROR: {name} failed.")
@@ -6,6 +6,7 @@ from django.conf import settings
 from django.core.management.base import BaseCommand
 from slack_bolt.adapter.socket_mode import SocketModeHandler
 
+from bot.ai.warmup import start_warm_up
 from bot.slack_app import app
 
 logger = logging.getLogger("bot")
@@ -24,6 +25,9 @@ class Command(BaseCommand):
         root.addHandler(handler_console)
         root.setLevel(logging.DEBUG)
 
+        if settings.LLM_WARMUP:
+            start_warm_up()
+
         logger.info("Starting Sherpa Slack bot...")
         sm_handler = SocketModeHandler(app, settings.SLACK_APP_TOKEN)
         sm_handler.start()
@@ -9,7 +9,8 @@ import httpx
 from bot.ai.classifier import classify_intent
 from bot.handlers import HANDLER_REGISTRY
 from bot.handlers.simple import HELP_TEXT
-from integrations.slack_format import format_error_message
+from bot.intent_fastpath import match_intent
+from integrations.slack_format import TRACKER_UNREACHABLE_BLOCKS, format_error_message
 from integrations.tracker import TrackerAPIError
 
 logger = logging.getLogger("bot.router")
@@ -27,7 +28,7 @@ def route(message: str, user_id: str, say) -> None:
         say(text=HELP_TEXT)
         return
 
-    result = classify_intent(message)
+    result = match_intent(message) or classify_intent(message)
     intent = result["intent"]
     params = result["params"]
 
@@ -48,8 +49,7 @@ def route(message: str, user_id: str, say) -> None:
             say(blocks=format_error_message(
                 f"The tracker returned an error: {exc.detail}"
             ))
-    except httpx.ConnectError:
-        logger.error("Could not reach tracker (intent=%s)", intent)
-        say(blocks=format_error_message(
-            "Could not reach the tracker. Please try again in a moment."
-        ))
+    except httpx.TransportError as exc:
+        # Covers refused connections and connect/read timeouts alike.
+        logger.error("Could not reach tracker (intent=%s): %r", intent, exc)
+        say(blocks=TRACKER_UNREACHABLE_BLOCKS)
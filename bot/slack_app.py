@@ -1,15 +1,26 @@
 """Slack Bolt application with command handlers."""
 
+import functools
 import logging
 import re
 
 import httpx
 from django.conf import settings
+from django.core.cache import cache
 from slack_bolt import App
 
-from bot.assignee import build_candidate_profiles, build_suggestion_prompt, suggest_assignee
+from bot.assignee import (
+    build_candidate_profiles,
+    build_suggestion_prompt,
+    build_target_profile,
+    suggest_assignee,
+)
+from bot.background import get_executor
+from bot.constants import VALID_STATUSES, VALID_STATUSES_HELP
 from bot.router import route
 from integrations.slack_format import (
+    TRACKER_ERROR_BLOCKS,
+    TRACKER_UNREACHABLE_BLOCKS,
     format_assignee_suggestion,
     format_eod_summary,
     format_error_message,
@@ -39,9 +50,92 @@ logger = logging.getLogger("bot")
 app = App(
     token=settings.SLACK_BOT_TOKEN,
     signing_secret=settings.SLACK_SIGNING_SECRET,
+    listener_executor=get_executor(),
 )
 
 
+_FETCHING_TEXT = ":hourglass_flowing_sand: Fetching from the tracker…"
+
+
+def _ack_fetching(ack, respond):
+    """Acknowledge with a placeholder and return a ``respond`` that replaces it.
+
+    The placeholder rides on the ack itself, so the user sees something
+    immediately at no extra request; the real reply then overwrites it.
+    """
+    ack(text=_FETCHING_TEXT)
+    return functools.partial(respond, replace_original=True)
+
+
+_TRACKER_AUTH_BLOCKS = format_error_message(
+    "Could not authenticate with the tracker. Please contact an admin."
+)
+_LINK_ERROR_BLOCKS = format_error_message(
+    "Could not link your account. Please check the username and try again."
+)
+
+# Usage replies for malformed command text; none of them vary per call.
+_TICKET_DETAIL_USAGE_BLOCKS = format_error_message(
+    "Please provide a ticket ID.\nUsage: `/ticket-detail <ticket-id>`"
+)
+_UPDATE_USAGE_BLOCKS = format_error_message(
+    f"Please provide a ticket ID and status.\n"
+    f"Usage: `/update <ticket-id> <status>`\n"
+    f"Valid statuses: {VALID_STATUSES_HELP}"
+)
+_STALE_USAGE_BLOCKS = format_error_message(
+    "Please provide a valid number of days.\nUsage: `/stale [days]` (default: 3)"
+)
+_SUGGEST_ASSIGNEE_USAGE_BLOCKS = format_error_message(
+    "Please provide a ticket ID.\nUsage: `/suggest-assignee <ticket-id>`"
+)
+
+
+def _tracker_safe(not_found=None, error=TRACKER_ERROR_BLOCKS, replace_original=False):
+    """Answer a command whose tracker call failed with a prebuilt error reply.
+
+    Handlers only deal with the happy path (and any error they want to word
+    themselves); a ``TrackerAPIError`` or ``httpx.TransportError`` (connection
+    refused, connect or read timeout) that escapes is logged and turned into
+    one of the shared error messages.
+
+    Args:
+        not_found: Blocks to send on a 404; other statuses get *error*.
+        error: Blocks to send for any other tracker API error.
+        replace_original: Set for handlers that acked via ``_ack_fetching``,
+            so the error replaces the placeholder like a normal reply.
+    """
+
+    def decorator(func):
+        # Bolt unwraps the listener to see which arguments it asks for and
+        # then passes them all by keyword.
+        @functools.wraps(func)
+        def wrapper(**kwargs):
+            try:
+                return func(**kwargs)
+            except TrackerAPIError as exc:
+                logger.error("Tracker API error in %s: %s", func.__name__, exc)
+                if exc.status_code == 404 and not_found is not None:
+                    blocks = not_found
+                elif exc.status_code in (401, 403):
+                    blocks = _TRACKER_AUTH_BLOCKS
+                else:
+                    blocks = error
+            except httpx.TransportError as exc:
+                logger.error("Could not reach tracker in %s: %r", func.__name__, exc)
+                blocks = TRACKER_UNREACHABLE_BLOCKS
+
+            respond = kwargs["respond"]
+            if replace_original:
+                respond(blocks=blocks, replace_original=True)
+            else:
+                respond(blocks=blocks)
+
+        return wrapper
+
+    return decorator
+
+
 @app.command("/hii")
 def handle_hii(ack, respond, command):
     ack()
@@ -49,34 +143,11 @@ def handle_hii(ack, respond, command):
 
 
 @app.command("/tickets")
+@_tracker_safe(not_found=format_no_tickets(), replace_original=True)
 def handle_tickets(ack, respond, command):
-    ack()
-
-    user_id = command["user_id"]
-    try:
-        tickets = get_tickets_for_user(user_id)
-    except TrackerAPIError as exc:
-        logger.error("Tracker API error for user %s: %s", user_id, exc)
-        if exc.status_code == 404:
-            respond(blocks=format_no_tickets())
-        elif exc.status_code in (401, 403):
-            respond(blocks=format_error_message(
-                "Could not authenticate with the tracker. Please contact an admin."
-            ))
-        else:
-            respond(blocks=format_error_message(
-                "The tracker returned an error. Please try again later."
-            ))
-        return
-    except httpx.ConnectError:
-        logger.error("Could not reach tracker for user %s", user_id)
-        respond(
-            blocks=format_error_message(
-                "Could not reach the tracker. Please try again in a moment."
-            )
-        )
-        return
+    respond = _ack_fetching(ack, respond)
 
+    tickets = get_tickets_for_user(command["user_id"])
     if not tickets:
         respond(blocks=format_no_tickets())
         return
@@ -84,13 +155,8 @@ def handle_tickets(ack, respond, command):
     respond(blocks=format_tickets_response(tickets))
 
 
-VALID_STATUSES = [
-    "planning", "todo", "open", "in_progress", "in_review", "review",
-    "done", "completed", "closed", "blocked",
-]
-
-
 @app.command("/link-user")
+@_tracker_safe(error=_LINK_ERROR_BLOCKS)
 def handle_link(ack, respond, command, client):
     ack()
 
@@ -111,43 +177,16 @@ def handle_link(ack, respond, command, client):
         ))
         return
 
-    try:
-        mapping, created = link_user(user_id, email)
-    except TrackerAPIError as exc:
-        logger.error("Tracker API error linking user %s: %s", user_id, exc)
-        respond(blocks=format_error_message(
-            "Could not link your account. Please check the username and try again."
-        ))
-        return
-    except httpx.ConnectError:
-        logger.error("Could not reach tracker for link user %s", user_id)
-        respond(blocks=format_error_message(
-            "Could not reach the tracker. Please try again in a moment."
-        ))
-        return
-
+    mapping, created = link_user(user_id, email)
     respond(blocks=format_link_result(mapping, created))
 
 
 @app.command("/ticket")
+@_tracker_safe(replace_original=True)
 def handle_ticket(ack, respond, command):
-    ack()
-
-    try:
-        tickets = get_all_tickets()
-    except TrackerAPIError as exc:
-        logger.error("Tracker API error fetching all tickets: %s", exc)
-        respond(blocks=format_error_message(
-            "The tracker returned an error. Please try again later."
-        ))
-        return
-    except httpx.ConnectError:
-        logger.error("Could not reach tracker for all tickets")
-        respond(blocks=format_error_message(
-            "Could not reach the tracker. Please try again in a moment."
-        ))
-        return
+    respond = _ack_fetching(ack, respond)
 
+    tickets = get_all_tickets()
     if not tickets:
         respond(blocks=format_no_tickets())
         return
@@ -156,61 +195,43 @@ def handle_ticket(ack, respond, command):
 
 
 @app.command("/ticket-detail")
+@_tracker_safe()
 def handle_ticket_detail(ack, respond, command):
     ack()
 
     ticket_id = command.get("text", "").strip().strip("<>")
 
     if not ticket_id:
-        respond(blocks=format_error_message(
-            "Please provide a ticket ID.\nUsage: `/ticket-detail <ticket-id>`"
-        ))
+        respond(blocks=_TICKET_DETAIL_USAGE_BLOCKS)
         return
 
     try:
         ticket = get_ticket_detail(ticket_id)
     except TrackerAPIError as exc:
-        logger.error("Tracker API error fetching ticket %s: %s", ticket_id, exc)
-        if exc.status_code == 404:
-            respond(blocks=format_error_message(
-                f"Ticket `{ticket_id}` was not found."
-            ))
-        else:
-            respond(blocks=format_error_message(
-                "The tracker returned an error. Please try again later."
-            ))
-        return
-    except httpx.ConnectError:
-        logger.error("Could not reach tracker for ticket %s", ticket_id)
-        respond(blocks=format_error_message(
-            "Could not reach the tracker. Please try again in a moment."
-        ))
+        if exc.status_code != 404:
+            raise
+        respond(blocks=format_error_message(f"Ticket `{ticket_id}` was not found."))
         return
 
     respond(blocks=format_ticket_detail(ticket))
 
 
 @app.command("/update")
+@_tracker_safe()
 def handle_update(ack, respond, command):
     ack()
 
     text = command.get("text", "").strip()
     parts = text.split(None, 1)
     if len(parts) < 2:
-        statuses = ", ".join(f"`{s}`" for s in VALID_STATUSES)
-        respond(blocks=format_error_message(
-            f"Please provide a ticket ID and status.\n"
-            f"Usage: `/update <ticket-id> <status>`\n"
-            f"Valid statuses: {statuses}"
-        ))
+        respond(blocks=_UPDATE_USAGE_BLOCKS)
         return
 
     ticket_id, status = parts[0], parts[1].strip().lower()
 
     if status not in VALID_STATUSES:
-        statuses = ", ".join(f"`{s}`" for s in VALID_STATUSES)
         respond(blocks=format_error_message(
-            f"`{status}` is not a valid status.\nValid statuses: {statuses}"
+            f"`{status}` is not a valid status.\nValid statuses: {VALID_STATUSES_HELP}"
         ))
         return
 
@@ -218,21 +239,9 @@ def handle_update(ack, respond, command):
     try:
         update_ticket(ticket_id, user_id, status=status)
     except TrackerAPIError as exc:
-        logger.error("Tracker API error updating ticket %s: %s", ticket_id, exc)
-        if exc.status_code == 404:
-            respond(blocks=format_error_message(
-                f"Ticket `{ticket_id}` was not found."
-            ))
-        else:
-            respond(blocks=format_error_message(
-                "The tracker returned an error. Please try again later."
-            ))
-        return
-    except httpx.ConnectError:
-        logger.error("Could not reach tracker for update %s", ticket_id)
-        respond(blocks=format_error_message(
-            "Could not reach the tracker. Please try again in a moment."
-        ))
+        if exc.status_code != 404:
+            raise
+        respond(blocks=format_error_message(f"Ticket `{ticket_id}` was not found."))
         return
 
     s_label = status.replace("_", " ").title()
@@ -242,31 +251,18 @@ def handle_update(ack, respond, command):
 
 
 @app.command("/summary")
+@_tracker_safe(replace_original=True)
 def handle_summary(ack, respond, command):
-    ack()
-
-    user_id = command["user_id"]
-    try:
-        summary = get_ticket_summary(user_id)
-    except TrackerAPIError as exc:
-        logger.error("Tracker API error for summary (user %s): %s", user_id, exc)
-        respond(blocks=format_error_message(
-            "The tracker returned an error. Please try again later."
-        ))
-        return
-    except httpx.ConnectError:
-        logger.error("Could not reach tracker for summary (user %s)", user_id)
-        respond(blocks=format_error_message(
-            "Could not reach the tracker. Please try again in a moment."
-        ))
-        return
+    respond = _ack_fetching(ack, respond)
 
+    summary = get_ticket_summary(command["user_id"])
     respond(blocks=format_summary(summary))
 
 
 @app.command("/stale")
+@_tracker_safe(replace_original=True)
 def handle_stale(ack, respond, command):
-    ack()
+    respond = _ack_fetching(ack, respond)
 
     text = command.get("text", "").strip()
     days = 3
@@ -274,30 +270,15 @@ def handle_stale(ack, respond, command):
         try:
             days = int(text)
         except ValueError:
-            respond(blocks=format_error_message(
-                "Please provide a valid number of days.\nUsage: `/stale [days]` (default: 3)"
-            ))
+            respond(blocks=_STALE_USAGE_BLOCKS)
             return
 
-    try:
-        tickets = get_stale_tickets(days)
-    except TrackerAPIError as exc:
-        logger.error("Tracker API error for stale tickets: %s", exc)
-        respond(blocks=format_error_message(
-            "The tracker returned an error. Please try again later."
-        ))
-        return
-    except httpx.ConnectError:
-        logger.error("Could not reach tracker for stale tickets")
-        respond(blocks=format_error_message(
-            "Could not reach the tracker. Please try again in a moment."
-        ))
-        return
-
+    tickets = get_stale_tickets(days)
     respond(blocks=format_stale_tickets(tickets, days))
 
 
 @app.command("/eod")
+@_tracker_safe()
 def handle_eod(ack, respond, command):
     ack()
 
@@ -306,21 +287,7 @@ def handle_eod(ack, respond, command):
     text = command.get("text", "").strip()
     target_date = text if text else dt_date.today().isoformat()
 
-    try:
-        tickets = get_tickets_by_date(target_date)
-    except TrackerAPIError as exc:
-        logger.error("Tracker API error for EOD summary: %s", exc)
-        respond(blocks=format_error_message(
-            "The tracker returned an error. Please try again later."
-        ))
-        return
-    except httpx.ConnectError:
-        logger.error("Could not reach tracker for EOD summary")
-        respond(blocks=format_error_message(
-            "Could not reach the tracker. Please try again in a moment."
-        ))
-        return
-
+    tickets = get_tickets_by_date(target_date)
     if not tickets:
         respond(blocks=format_error_message(
             f"No ticket activity found for *{target_date}*."
@@ -331,11 +298,11 @@ def handle_eod(ack, respond, command):
 
 
 @app.command("/retro")
+@_tracker_safe()
 def handle_retro(ack, respond, command):
     ack()
 
     from bot.handlers.complex import (
-        DONE_STATUSES,
         _compute_sprint_stats,
         _resolve_sprint,
     )
@@ -351,21 +318,7 @@ def handle_retro(ack, respond, command):
         else:
             params["sprint_name"] = text
 
-    try:
-        sprint = _resolve_sprint(params)
-    except TrackerAPIError as exc:
-        logger.error("Tracker API error for /retro: %s", exc)
-        respond(blocks=format_error_message(
-            "The tracker returned an error. Please try again later."
-        ))
-        return
-    except httpx.ConnectError:
-        logger.error("Could not reach tracker for /retro")
-        respond(blocks=format_error_message(
-            "Could not reach the tracker. Please try again in a moment."
-        ))
-        return
-
+    sprint = _resolve_sprint(params)
     if not sprint:
         respond(blocks=format_error_message("No sprints found. Please check your tracker."))
         return
@@ -373,21 +326,7 @@ def handle_retro(ack, respond, command):
     sprint_id = sprint.get("id")
     sprint_name = sprint.get("name", "Unknown")
 
-    try:
-        tickets = get_sprint_tickets(sprint_id)
-    except TrackerAPIError as exc:
-        logger.error("Tracker API error fetching sprint tickets: %s", exc)
-        respond(blocks=format_error_message(
-            "The tracker returned an error. Please try again later."
-        ))
-        return
-    except httpx.ConnectError:
-        logger.error("Could not reach tracker for sprint tickets")
-        respond(blocks=format_error_message(
-            "Could not reach the tracker. Please try again in a moment."
-        ))
-        return
-
+    tickets = get_sprint_tickets(sprint_id)
     if not tickets:
         respond(blocks=format_error_message(f"No tickets found for sprint *{sprint_name}*."))
         return
@@ -404,6 +343,8 @@ def handle_retro(ack, respond, command):
 # Regex to detect ticket-creation messages from the tracker bot.
 # Matches e.g. "Ticket BZ-63 'hi' created successfully!"
 _TICKET_CREATED_RE = re.compile(r"Ticket\s+(\S+)\s+.*created", re.IGNORECASE)
+# Bot/user mention markup, e.g. <@U12345>
+_MENTION_RE = re.compile(r"<@[A-Z0-9]+>")
 
 
 def _get_assignee_suggestion(ticket_id: str) -> list[dict]:
@@ -414,7 +355,11 @@ def _get_assignee_suggestion(ticket_id: str) -> list[dict]:
     """
     target_ticket = get_ticket_detail(ticket_id)
     all_tickets = get_all_tickets()
-    candidates = build_candidate_profiles(target_ticket, all_tickets)
+    profile = build_target_profile(target_ticket)
+    # The prompt uses the top 5 and the Team Stats block shows the top 6.
+    candidates = build_candidate_profiles(
+        target_ticket, all_tickets, profile=profile, max_candidates=6,
+    )
 
     if not candidates:
         return format_error_message(
@@ -435,7 +380,7 @@ def _get_assignee_suggestion(ticket_id: str) -> list[dict]:
         }
         return format_assignee_suggestion(target_ticket, suggestion, candidates)
 
-    prompt = build_suggestion_prompt(target_ticket, candidates)
+    prompt = build_suggestion_prompt(target_ticket, candidates, profile=profile)
     suggestion = suggest_assignee(prompt)
 
     if not suggestion.get("assignee"):
@@ -451,35 +396,22 @@ def _get_assignee_suggestion(ticket_id: str) -> list[dict]:
 
 
 @app.command("/suggest-assignee")
+@_tracker_safe()
 def handle_suggest_assignee(ack, respond, command):
     ack()
 
     ticket_id = command.get("text", "").strip().strip("<>")
 
     if not ticket_id:
-        respond(blocks=format_error_message(
-            "Please provide a ticket ID.\nUsage: `/suggest-assignee <ticket-id>`"
-        ))
+        respond(blocks=_SUGGEST_ASSIGNEE_USAGE_BLOCKS)
         return
 
     try:
         blocks = _get_assignee_suggestion(ticket_id)
     except TrackerAPIError as exc:
-        logger.error("Tracker API error for suggest-assignee %s: %s", ticket_id, exc)
-        if exc.status_code == 404:
-            respond(blocks=format_error_message(
-                f"Ticket `{ticket_id}` was not found."
-            ))
-        else:
-            respond(blocks=format_error_message(
-                "The tracker returned an error. Please try again later."
-            ))
-        return
-    except httpx.ConnectError:
-        logger.error("Could not reach tracker for suggest-assignee %s", ticket_id)
-        respond(blocks=format_error_message(
-            "Could not reach the tracker. Please try again in a moment."
-        ))
+        if exc.status_code != 404:
+            raise
+        respond(blocks=format_error_message(f"Ticket `{ticket_id}` was not found."))
         return
 
     respond(blocks=blocks)
@@ -491,14 +423,45 @@ def handle_suggest_assignee(ack, respond, command):
 
 def _handle_natural_message(text: str, user_id: str, say):
     """Route a natural-language message to the right tracker action."""
-    # Strip bot mention markup (e.g. <@U12345>) so the LLM sees clean text
-    clean = re.sub(r"<@[A-Z0-9]+>", "", text).strip()
+    # Strip bot mention markup (e.g. <@U12345>) so the LLM sees clean text.
+    # DMs rarely contain any, and the substring test is cheaper than a regex pass.
+    if "<@" in text:
+        text = _MENTION_RE.sub("", text)
+    clean = text.strip()
     route(clean, user_id, say)
 
 
+# Slack redelivers an event (same event_id) when it thinks the first delivery
+# wasn't acknowledged in time; remember ids long enough to cover its retries.
+_EVENT_DEDUP_TTL = 3600
+
+
+def _is_redelivery(body: dict) -> bool:
+    """Return True if this event_id has already been handled.
+
+    Checked via an atomic ``cache.add`` so a retry landing on another worker
+    (or another bot instance sharing Redis) is also dropped. Events without
+    an id, or arriving while the cache is unreachable, are always processed.
+    """
+    event_id = body.get("event_id")
+    if not event_id:
+        return False
+    try:
+        if cache.add(f"slack_event:{event_id}", True, timeout=_EVENT_DEDUP_TTL):
+            return False
+    except Exception:
+        logger.warning("Event dedup cache unavailable; processing %s", event_id, exc_info=True)
+        return False
+    logger.info("Skipping redelivered Slack event %s (retry %s)", event_id, body.get("retry_attempt"))
+    return True
+
+
 @app.event("message")
-def handle_dm(event, say):
+def handle_dm(event, body, say):
     """Handle direct messages and detect ticket-creation bot messages."""
+    if _is_redelivery(body):
+        return
+
     text = event.get("text", "")
     subtype = event.get("subtype")
 
@@ -511,7 +474,7 @@ def handle_dm(event, say):
             try:
                 blocks = _get_assignee_suggestion(ticket_id)
                 say(blocks=blocks, thread_ts=event.get("ts"))
-            except (TrackerAPIError, httpx.ConnectError):
+            except (TrackerAPIError, httpx.TransportError):
                 logger.exception("Auto-suggest failed for %s", ticket_id)
         return
 
@@ -524,8 +487,11 @@ def handle_dm(event, say):
 
 
 @app.event("app_mention")
-def handle_mention(event, say):
+def handle_mention(event, body, say):
     """Handle @mentions of the bot in channels."""
+    if _is_redelivery(body):
+        return
+
     text = event.get("text", "")
     user_id = event.get("user", "")
     _handle_natural_message(text, user_id, say)
@@ -2,21 +2,22 @@
 
 import hashlib
 import hmac
-import json
 import logging
 import re
 
+import orjson
 from django.conf import settings
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
-from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 from django.http import FileResponse, JsonResponse
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
+from bot.constants import DONE_STATUSES
 from bot.models import Member
 from integrations.github import GitHubAuthError, verify_github_token
+from integrations.slack_client import get_slack_client
 from bot.ai.project_matcher import match_project_ai
 from integrations.tracker import (
     TrackerAPIError,
@@ -28,6 +29,7 @@ from integrations.tracker import (
     get_ticket_detail,
     get_tickets_for_user,
     link_user,
+    sprint_status,
     update_ticket,
 )
 
@@ -77,7 +79,7 @@ def _send_pr_naming_alert(title, branch, pr_url, pr_number, repo_name, gh_userna
         logger.warning("Cannot send PR naming alert — no channel or Slack token configured")
         return
 
-    slack = WebClient(token=settings.SLACK_BOT_TOKEN)
+    slack = get_slack_client()
 
     blocks = [
         {
@@ -174,7 +176,7 @@ def _resolve_member(request):
 
     if member.email and not member.slack_user_id and settings.SLACK_BOT_TOKEN:
         try:
-            slack = WebClient(token=settings.SLACK_BOT_TOKEN)
+            slack = get_slack_client()
             resp = slack.users_lookupByEmail(email=member.email)
             member.slack_user_id = resp["user"]["id"]
             member.save(update_fields=["slack_user_id"])
@@ -221,8 +223,8 @@ def github_webhook(request):
         return JsonResponse({"ok": True, "ignored": True})
 
     try:
-        payload = json.loads(request.body)
-    except (json.JSONDecodeError, ValueError):
+        payload = orjson.loads(request.body)
+    except orjson.JSONDecodeError:
         return JsonResponse({"ok": False, "error": "invalid JSON"}, status=400)
 
     action = payload.get("action")
@@ -408,7 +410,7 @@ def vscode_sprint_progress(request):
         logger.error("Tracker API error: %s", e)
         return Response({"error": "Failed to fetch sprints"}, status=502)
 
-    active = next((s for s in sprints if s.get("status") == "active"), None)
+    active = next((s for s in sprints if sprint_status(s) == "active"), None)
     if not active:
         return Response({"sprint": None, "progress": None})
 
@@ -418,7 +420,6 @@ def vscode_sprint_progress(request):
         logger.error("Tracker API error: %s", e)
         return Response({"error": "Failed to fetch sprint tickets"}, status=502)
 
-    done_statuses = {"done", "completed", "closed"}
     in_progress_statuses = {"in_progress", "in_review"}
     todo_statuses = {"todo", "open", "planning"}
     blocked_statuses = {"blocked"}
@@ -426,7 +427,7 @@ def vscode_sprint_progress(request):
     done = in_progress = todo = blocked = other = 0
     for t in tickets:
         st = (t.get("status") or "").lower()
-        if st in done_statuses:
+        if st in DONE_STATUSES:
             done += 1
         elif st in in_progress_statuses:
             in_progress += 1
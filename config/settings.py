@@ -1,5 +1,6 @@
 """Django settings for the Sherpa project."""
 
+import os
 from pathlib import Path
 
 import environ
@@ -96,6 +97,11 @@ SLACK_BOT_TOKEN = env("SLACK_BOT_TOKEN", default="")
 SLACK_SIGNING_SECRET = env("SLACK_SIGNING_SECRET", default="")
 SLACK_APP_TOKEN = env("SLACK_APP_TOKEN", default="")
 
+# Threads in the shared pool that runs Slack listeners and handler background
+# work (bot.background). Handlers mostly wait on the tracker, Slack and the
+# LLM, so this is sized for I/O rather than CPU count.
+SHERPA_LISTENER_WORKERS = env.int("SHERPA_LISTENER_WORKERS", default=(os.cpu_count() or 4) * 5)
+
 # Sprint retro auto-post channel
 RETRO_SLACK_CHANNEL = env("RETRO_SLACK_CHANNEL", default="C0AFST8QY6N")
 
@@ -105,6 +111,9 @@ PROJECT_SLACK_CHANNELS = env.json("PROJECT_SLACK_CHANNELS", default={})
 # Tracker
 TRACKER_API_URL = env("TRACKER_API_URL", default="https://tracker.blaziken.in")
 TRACKER_API_TOKEN = env("TRACKER_API_TOKEN", default="")
+# Share cached tracker reads through CACHES["default"] (Redis) so all workers
+# and bot instances reuse one fetch; off keeps the cache per-process.
+TRACKER_CACHE_SHARED = env.bool("TRACKER_CACHE_SHARED", default=True)
 
 # GitHub
 GITHUB_WEBHOOK_SECRET = env("GITHUB_WEBHOOK_SECRET", default="")
@@ -116,7 +125,29 @@ LLM_MODEL_PATH = env(
 )
 LLM_N_CTX = env.int("LLM_N_CTX", default=2048)
 LLM_N_THREADS = env.int("LLM_N_THREADS", default=2)
+# Layers to offload to the GPU (-1 = all); ignored by CPU-only llama.cpp builds.
+LLM_N_GPU_LAYERS = env.int("LLM_N_GPU_LAYERS", default=-1)
+# Optional smaller quantized GGUF for JSON field extraction (create/update
+# tickets, assignee suggestions); empty means use LLM_MODEL_PATH for everything.
+LLM_SMALL_MODEL_PATH = env("LLM_SMALL_MODEL_PATH", default="")
+# OpenAI-compatible server (vLLM, TGI, llama-server --parallel) that batches
+# concurrent requests; when set, it replaces the in-process llama.cpp models.
+LLM_API_BASE = env("LLM_API_BASE", default="")
+LLM_API_KEY = env("LLM_API_KEY", default="")
+LLM_API_MODEL = env("LLM_API_MODEL", default="")
+# Model for extraction calls; lets short JSON requests batch separately from
+# long narratives. Empty means LLM_API_MODEL.
+LLM_API_SMALL_MODEL = env("LLM_API_SMALL_MODEL", default="")
+# Load models and prime the classifier prompt when run_slack_bot starts.
+LLM_WARMUP = env.bool("LLM_WARMUP", default=True)
 
 # RAG / FAISS
 FAISS_INDEX_DIR = env("FAISS_INDEX_DIR", default=str(BASE_DIR / "faiss_index"))
 RAG_EMBEDDING_MODEL = env("RAG_EMBEDDING_MODEL", default="all-MiniLM-L6-v2")
+# "torch", "onnx" or "openvino"; the latter two need sentence-transformers[onnx]
+# or sentence-transformers[openvino] installed.
+RAG_EMBEDDING_BACKEND = env("RAG_EMBEDDING_BACKEND", default="torch")
+# ONNX file inside the model repo, e.g. "onnx/model_qint8_avx512_vnni.onnx" for int8.
+RAG_EMBEDDING_ONNX_FILE = env("RAG_EMBEDDING_ONNX_FILE", default="")
+# Search breadth for HNSW indexes (scripts/build_fssai_index.py --index-type hnsw)
+RAG_HNSW_EF_SEARCH = env.int("RAG_HNSW_EF_SEARCH", default=64)
@@ -0,0 +1,206 @@
+"""Two-level response cache for read-only API calls.
+
+Each decorated function gets its own TTL. Results are kept in-process and,
+when ``TRACKER_CACHE_SHARED`` is on, in the Django cache (Redis) so every
+worker and bot instance shares them. On top of plain expiry the cache:
+
+* coalesces concurrent misses for the same key into one upstream call —
+  in-process via a shared future, across processes via a short
+  ``cache.add`` lock that other callers wait on;
+* keeps expired entries for ``_STALE_WINDOW`` seconds and serves them if the
+  upstream call fails with a network error.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import Future
+
+import httpx
+from django.conf import settings
+from django.core.cache import cache as shared_cache
+
+logger = logging.getLogger("integrations.cache")
+
+# How long past expiry an entry may still be served when upstream is down.
+_STALE_WINDOW = 600
+_MAX_ENTRIES = 1024
+
+# Shared-cache keys; bumping the generation invalidates every entry at once.
+_SHARED_PREFIX = "apicache"
+_GEN_KEY = f"{_SHARED_PREFIX}:gen"
+# How long one process may hold the fetch lock before others stop waiting.
+_LOCK_TTL = 5
+_POLL_INTERVAL = 0.05
+
+# key -> (fresh_until, stale_until, value, generation)
+_entries: dict[tuple, tuple[float, float, object, int | None]] = {}
+_inflight: dict[tuple, Future] = {}
+_lock = threading.Lock()
+
+
+def _store(key: tuple, ttl: float, value: object, gen: int | None) -> None:
+    now = time.monotonic()
+    with _lock:
+        _entries.pop(key, None)
+        _entries[key] = (now + ttl, now + ttl + _STALE_WINDOW, value, gen)
+        if len(_entries) > _MAX_ENTRIES:
+            # Dicts keep insertion order, so the first key is the oldest write.
+            del _entries[next(iter(_entries))]
+
+
+def _current_generation() -> int | None:
+    """Return the shared generation, 0 if sharing is off, or None if unreachable.
+
+    In-process entries remember the generation they were stored under, so a
+    ``clear()`` in another process (scheduler, web worker) evicts them too.
+    """
+    if not settings.TRACKER_CACHE_SHARED:
+        return 0
+    try:
+        return shared_cache.get(_GEN_KEY, 0)
+    except Exception:
+        logger.debug("Shared cache unavailable; trusting in-process entries", exc_info=True)
+        return None
+
+
+def _read_shared(skey: str) -> tuple[int, tuple[float, object] | None]:
+    """Return the current generation and the live ``(fresh_until, value)`` entry."""
+    got = shared_cache.get_many([_GEN_KEY, skey])
+    gen = got.get(_GEN_KEY, 0)
+    entry = got.get(skey)
+    if entry is None or entry[0] != gen:
+        return gen, None
+    return gen, (entry[1], entry[2])
+
+
+def _load_shared(key: tuple, ttl: float, call) -> tuple[int | None, object]:
+    """Fetch *key* through the shared cache, calling upstream on a miss.
+
+    Returns the generation the result belongs to (None if the shared cache
+    couldn't be read) and the result.
+    """
+    skey = f"{_SHARED_PREFIX}:{hashlib.sha1(repr(key).encode()).hexdigest()}"
+    try:
+        gen, entry = _read_shared(skey)
+    except Exception:
+        logger.debug("Shared cache unavailable; calling upstream", exc_info=True)
+        return None, call()
+
+    if entry is not None and entry[0] > time.time():
+        return gen, entry[1]
+
+    lock_key = f"{skey}:lock"
+    try:
+        locked = shared_cache.add(lock_key, 1, timeout=_LOCK_TTL)
+    except Exception:
+        logger.debug("Shared cache unavailable; calling upstream", exc_info=True)
+        return None, call()
+
+    if not locked:
+        # Another process is fetching this key; wait briefly for its result.
+        deadline = time.monotonic() + _LOCK_TTL
+        try:
+            while time.monotonic() < deadline:
+                time.sleep(_POLL_INTERVAL)
+                _, waited = _read_shared(skey)
+                if waited is not None and waited[0] > time.time():
+                    return gen, waited[1]
+        except Exception:
+            logger.debug("Shared cache unavailable while waiting; calling upstream", exc_info=True)
+
+    try:
+        result = call()
+    except httpx.HTTPError as exc:
+        if entry is None:
+            raise
+        logger.warning("%s failed (%s); serving shared cached result", key[0], exc)
+        return gen, entry[1]
+    finally:
+        if locked:
+            try:
+                shared_cache.delete(lock_key)
+            except Exception:
+                # The lock expires on its own after _LOCK_TTL.
+                logger.debug("Could not release %s", lock_key, exc_info=True)
+
+    try:
+        shared_cache.set(skey, (gen, time.time() + ttl, result), timeout=ttl + _STALE_WINDOW)
+    except Exception:
+        logger.debug("Could not store %s in the shared cache", key[0], exc_info=True)
+    return gen, result
+
+
+def cached(ttl: float):
+    """Cache a read-only call for *ttl* seconds.
+
+    Keyed on the function name and its arguments. Errors are not cached.
+    Callers must treat the returned lists and dicts as read-only.
+
+    Args:
+        ttl: Seconds a result is served without calling upstream again.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+            gen = _current_generation()
+            now = time.monotonic()
+            with _lock:
+                entry = _entries.get(key)
+                if entry is not None and entry[0] > now and (gen is None or entry[3] == gen):
+                    return entry[2]
+                future = _inflight.get(key)
+                owner = future is None
+                if owner:
+                    future = _inflight[key] = Future()
+
+            if not owner:
+                return future.result()
+
+            try:
+                if settings.TRACKER_CACHE_SHARED:
+                    gen, result = _load_shared(key, ttl, lambda: func(*args, **kwargs))
+                else:
+                    result = func(*args, **kwargs)
+            except httpx.HTTPError as exc:
+                if entry is not None and entry[1] > now:
+                    logger.warning("%s failed (%s); serving cached result", func.__name__, exc)
+                    future.set_result(entry[2])
+                    return entry[2]
+                future.set_exception(exc)
+                raise
+            except BaseException as exc:
+                future.set_exception(exc)
+                raise
+            else:
+                _store(key, ttl, result, gen)
+                future.set_result(result)
+                return result
+            finally:
+                with _lock:
+                    _inflight.pop(key, None)
+
+        return wrapper
+
+    return decorator
+
+
+def clear() -> None:
+    """Drop every cached entry, here and in the shared cache (e.g. after a write)."""
+    with _lock:
+        _entries.clear()
+    if not settings.TRACKER_CACHE_SHARED:
+        return
+    try:
+        shared_cache.incr(_GEN_KEY)
+    except ValueError:
+        # incr() raises if the generation key doesn't exist yet.
+        shared_cache.set(_GEN_KEY, 1, timeout=None)
+    except Exception:
+        logger.warning("Could not invalidate the shared cache", exc_info=True)
@@ -0,0 +1,19 @@
+"""Shared Slack Web API client for code running outside the Bolt app."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+from django.conf import settings
+from slack_sdk import WebClient
+
+
+@lru_cache(maxsize=1)
+def get_slack_client() -> WebClient:
+    """Return the process-wide bot-token ``WebClient``, creating it on first use.
+
+    Cron jobs, webhook views and the batch sender all post with the same
+    token, so they share one client instead of building a new one per call
+    (and, under ``run_scheduler``, per run).
+    """
+    return WebClient(token=settings.SLACK_BOT_TOKEN)
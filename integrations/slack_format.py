@@ -94,21 +94,25 @@ def format_tickets_response(
     return blocks
 
 
+_NO_TICKETS_BLOCKS: list[dict] = [
+    {
+        "type": "section",
+        "text": {
+            "type": "mrkdwn",
+            "text": ":tada: *No tickets found!* You're all clear.",
+        },
+    },
+]
+
+
 def format_no_tickets() -> list[dict]:
     """Format an 'all clear' message when the user has no tickets.
 
     Returns:
-        A list of Block Kit block dicts.
+        A list of Block Kit block dicts. The same prebuilt list is returned
+        on every call, so callers must not modify it.
     """
-    return [
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": ":tada: *No tickets found!* You're all clear.",
-            },
-        },
-    ]
+    return _NO_TICKETS_BLOCKS
 
 
 def format_error_message(error: str) -> list[dict]:
@@ -131,6 +135,15 @@ def format_error_message(error: str) -> list[dict]:
     ]
 
 
+# Prebuilt blocks for the tracker errors most handlers share. Read-only.
+TRACKER_UNREACHABLE_BLOCKS = format_error_message(
+    "Could not reach the tracker. Please try again in a moment."
+)
+TRACKER_ERROR_BLOCKS = format_error_message(
+    "The tracker returned an error. Please try again later."
+)
+
+
 def format_sprint_report(sprint_name: str, stats: dict) -> list[dict]:
     """Format a sprint report as Block Kit blocks.
 
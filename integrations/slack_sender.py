@@ -0,0 +1,104 @@
+"""Rate-limited, concurrent Slack message sending for batch jobs.
+
+Cron commands post one message per project, developer, or PM. Sending
+them one after another costs a full Slack round-trip each; this module
+sends them from a small thread pool instead. It spaces messages to the
+same channel at least ``_CHANNEL_INTERVAL`` seconds apart (Slack's
+per-channel posting limit) and retries after ``Retry-After`` on HTTP 429.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web import SlackResponse
+
+from integrations.slack_client import get_slack_client
+
+logger = logging.getLogger("integrations.slack_sender")
+
+_MAX_WORKERS = 8
+_CHANNEL_INTERVAL = 1.0
+_MAX_RETRIES = 3
+
+_pool: ThreadPoolExecutor | None = None
+_init_lock = threading.Lock()
+
+# channel -> earliest monotonic time the next message may be sent
+_next_slot: dict[str, float] = {}
+_slot_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    """Return the sender pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _init_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix="slack-send")
+    return _pool
+
+
+def _wait_for_slot(channel: str) -> None:
+    """Block until *channel* may receive another message.
+
+    Slots are reserved under the lock, so concurrent senders to one channel
+    queue up ``_CHANNEL_INTERVAL`` apart instead of all waking at once.
+    """
+    with _slot_lock:
+        now = time.monotonic()
+        slot = max(now, _next_slot.get(channel, 0.0))
+        _next_slot[channel] = slot + _CHANNEL_INTERVAL
+    if slot > now:
+        time.sleep(slot - now)
+
+
+def _retry_after(headers: dict) -> int:
+    """Return the ``Retry-After`` delay in seconds, defaulting to 1.
+
+    Header names aren't normalised by the SDK, so the lookup ignores case.
+    """
+    for name, value in headers.items():
+        if name.lower() == "retry-after":
+            try:
+                return max(1, int(float(value)))
+            except (TypeError, ValueError):
+                break
+    return 1
+
+
+def _send(client: WebClient, channel: str, blocks: list[dict] | str | None, text: str) -> SlackResponse:
+    """Post one message, retrying on rate limits."""
+    retries = 0
+    while True:
+        _wait_for_slot(channel)
+        try:
+            return client.chat_postMessage(channel=channel, blocks=blocks, text=text)
+        except SlackApiError as exc:
+            if exc.response.status_code != 429 or retries >= _MAX_RETRIES:
+                raise
+            retries += 1
+            retry_after = _retry_after(exc.response.headers)
+            logger.warning("Rate limited posting to %s, retrying in %ss", channel, retry_after)
+            time.sleep(retry_after)
+
+
+def post(channel: str, blocks: list[dict] | str | None = None, text: str = "") -> Future[SlackResponse]:
+    """Queue a ``chat.postMessage`` and return a future for its response.
+
+    Args:
+        channel: Channel or user ID to post to.
+        blocks: Optional Block Kit blocks, or the same blocks already
+            JSON-encoded when one payload goes to several channels.
+        text: Fallback/notification text.
+
+    Returns:
+        A future resolving to the Slack response. ``result()`` re-raises
+        the ``SlackApiError`` (or network error) if the send failed.
+    """
+    return _get_pool().submit(_send, get_slack_client(), channel, blocks, text)
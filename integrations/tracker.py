@@ -2,13 +2,70 @@
 
 from __future__ import annotations
 
+import atexit
 import logging
+import threading
+from collections.abc import Collection
 
 import httpx
 from django.conf import settings
 
+from integrations import cache
+
 logger = logging.getLogger("integrations.tracker")
 
+_client: httpx.Client | None = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> httpx.Client:
+    """Return the shared HTTP client, creating it on first use.
+
+    One pooled HTTP/2 client keeps connections to the tracker alive across
+    calls, so only the first request pays the TCP/TLS handshake. The base
+    URL, auth header and timeout are set here once for every request.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(
+                    base_url=settings.TRACKER_API_URL,
+                    headers={"Authorization": f"Bearer {settings.TRACKER_API_TOKEN}"},
+                    # Fail fast on an unreachable tracker instead of holding a
+                    # Slack handler past its 3-second window.
+                    timeout=httpx.Timeout(10, connect=2),
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_keepalive_connections=20,
+                        max_connections=100,
+                        keepalive_expiry=60,
+                    ),
+                )
+                atexit.register(_client.close)
+    return _client
+
+
+# Read endpoints users tend to hit back to back (greeting -> "my tickets" ->
+# "summary") are cached briefly; writes clear the cache.
+def invalidate_cache() -> None:
+    """Drop all cached tracker reads (called after any write)."""
+    cache.clear()
+
+
+def prefetch_user_data(slack_user_id: str) -> None:
+    """Warm the cache with a user's tickets and summary.
+
+    Used when a follow-up request is likely (e.g. after a greeting), and
+    meant to be run off the request thread. Failures are ignored; the real
+    request will surface them.
+    """
+    try:
+        get_tickets_for_user(slack_user_id)
+        get_ticket_summary(slack_user_id)
+    except Exception:
+        logger.debug("Prefetch failed for %s", slack_user_id, exc_info=True)
+
 
 class TrackerAPIError(Exception):
     """Raised when the Tracker API returns a non-2xx response."""
@@ -19,6 +76,8 @@ class TrackerAPIError(Exception):
         super().__init__(f"Tracker API error {status_code}: {detail}")
 
 
+# Projects and sprints change over hours or days, so they are cached longer.
+@cache.cached(ttl=300)
 def get_projects() -> list[dict]:
     """Fetch all projects from the Tracker API.
 
@@ -29,10 +88,9 @@ def get_projects() -> list[dict]:
         TrackerAPIError: If the API returns a non-2xx status.
         httpx.ConnectError: If the tracker is unreachable.
     """
-    url = f"{settings.TRACKER_API_URL}/api/projects/"
-    headers = {"Authorization": f"Bearer {settings.TRACKER_API_TOKEN}"}
+    url = "/api/projects/"
 
-    response = httpx.get(url, headers=headers, timeout=10)
+    response = _get_client().get(url)
 
     if response.status_code != 200:
         raise TrackerAPIError(response.status_code, response.text)
@@ -41,6 +99,7 @@ def get_projects() -> list[dict]:
     return data.get("projects", data)
 
 
+@cache.cached(ttl=30)
 def get_tickets_for_user(
     slack_user_id: str,
     status: str | None = None,
@@ -66,10 +125,9 @@ def get_tickets_for_user(
     if priority:
         params["priority"] = priority
 
-    url = f"{settings.TRACKER_API_URL}/api/my-tickets/"
-    headers = {"Authorization": f"Bearer {settings.TRACKER_API_TOKEN}"}
+    url = "/api/my-tickets/"
 
-    response = httpx.get(url, params=params, headers=headers, timeout=10)
+    response = _get_client().get(url, params=params)
 
     if response.status_code != 200:
         raise TrackerAPIError(response.status_code, response.text)
@@ -94,14 +152,14 @@ def link_user(slack_user_id: str, email: str) -> tuple[dict, bool]:
         TrackerAPIError: If the API returns a non-2xx status.
         httpx.ConnectError: If the tracker is unreachable.
     """
-    url = f"{settings.TRACKER_API_URL}/api/link-user/"
-    headers = {"Authorization": f"Bearer {settings.TRACKER_API_TOKEN}"}
+    url = "/api/link-user/"
     payload = {"slack_user_id": slack_user_id, "email": email}
 
-    response = httpx.post(url, json=payload, headers=headers, timeout=10)
+    response = _get_client().post(url, json=payload)
 
     if response.status_code not in (200, 201):
         raise TrackerAPIError(response.status_code, response.text)
+    invalidate_cache()
 
     data = response.json()
     return data.get("mapping", data), response.status_code == 201
@@ -121,18 +179,19 @@ def create_ticket(ticket_data: dict) -> dict:
         TrackerAPIError: If the API returns a non-2xx status.
         httpx.ConnectError: If the tracker is unreachable.
     """
-    url = f"{settings.TRACKER_API_URL}/api/tickets/"
-    headers = {"Authorization": f"Bearer {settings.TRACKER_API_TOKEN}"}
+    url = "/api/tickets/"
 
-    response = httpx.post(url, json=ticket_data, headers=headers, timeout=10)
+    response = _get_client().post(url, json=ticket_data)
 
     if response.status_code not in (200, 201):
         raise TrackerAPIError(response.status_code, response.text)
+    invalidate_cache()
 
     data = response.json()
     return data.get("ticket", data)
 
 
+@cache.cached(ttl=15)
 def get_all_tickets(
     status: str | None = None,
     priority: str | None = None,
@@ -156,10 +215,9 @@ def get_all_tickets(
     if priority:
         params["priority"] = priority
 
-    url = f"{settings.TRACKER_API_URL}/api/tickets/"
-    headers = {"Authorization": f"Bearer {settings.TRACKER_API_TOKEN}"}
+    url = "/api/tickets/"
 
-    response = httpx.get(url, params=params, headers=headers, timeout=10)
+    response = _get_client().get(url, params=params)
 
     if response.status_code != 200:
         raise TrackerAPIError(response.status_code, response.text)
@@ -168,6 +226,7 @@ def get_all_tickets(
     return data.get("tickets", data)
 
 
+@cache.cached(ttl=5)
 def get_ticket_detail(ticket_id: str) -> dict:
     """Fetch detailed info for a single ticket.
 
@@ -181,10 +240,9 @@ def get_ticket_detail(ticket_id: str) -> dict:
         TrackerAPIError: If the API returns a non-2xx status.
         httpx.ConnectError: If the tracker is unreachable.
     """
-    url = f"{settings.TRACKER_API_URL}/api/tickets/{ticket_id}/"
-    headers = {"Authorization": f"Bearer {settings.TRACKER_API_TOKEN}"}
+    url = f"/api/tickets/{ticket_id}/"
 
-    response = httpx.get(url, headers=headers, timeout=10)
+    response = _get_client().get(url)
 
     if response.status_code != 200:
         raise TrackerAPIError(response.status_code, response.text)
@@ -193,6 +251,7 @@ def get_ticket_detail(ticket_id: str) -> dict:
     return data.get("ticket", data)
 
 
+@cache.cached(ttl=60)
 def get_stale_tickets(days: int = 3) -> list[dict]:
     """Fetch tickets with no updates in the given number of days.
 
@@ -206,11 +265,10 @@ def get_stale_tickets(days: int = 3) -> list[dict]:
         TrackerAPIError: If the API returns a non-2xx status.
         httpx.ConnectError: If the tracker is unreachable.
     """
-    url = f"{settings.TRACKER_API_URL}/api/tickets/stale/"
-    headers = {"Authorization": f"Bearer {settings.TRACKER_API_TOKEN}"}
+    url = "/api/tickets/stale/"
     params = {"days": str(days)}
 
-    response = httpx.get(url, params=params, headers=headers, timeout=10)
+    response = _get_client().get(url, params=params)
 
     if response.status_code != 200:
         raise TrackerAPIError(response.status_code, response.text)
@@ -219,6 +277,7 @@ def get_stale_tickets(days: int = 3) -> list[dict]:
     return data.get("tickets", data)
 
 
+@cache.cached(ttl=30)
 def get_ticket_summary(slack_user_id: str | None = None) -> dict:
     """Fetch a summary of ticket counts grouped by status.
 
@@ -232,13 +291,12 @@ def get_ticket_summary(slack_user_id: str | None = None) -> dict:
         TrackerAPIError: If the API returns a non-2xx status.
         httpx.ConnectError: If the tracker is unreachable.
     """
-    url = f"{settings.TRACKER_API_URL}/api/tickets/summary/"
-    headers = {"Authorization": f"Bearer {settings.TRACKER_API_TOKEN}"}
+    url = "/api/tickets/summary/"
     params: dict[str, str] = {}
     if slack_user_id:
         params["slack_user_id"] = slack_user_id
 
-    response = httpx.get(url, params=params, headers=headers, timeout=10)
+    response = _get_client().get(url, params=params)
 
     if response.status_code != 200:
         raise TrackerAPIError(response.status_code, response.text)
@@ -259,11 +317,10 @@ def get_tickets_by_date(target_date: str) -> list[dict]:
         TrackerAPIError: If the API returns a non-2xx status.
         httpx.ConnectError: If the tracker is unreachable.
     """
-    url = f"{settings.TRACKER_API_URL}/api/tickets/"
-    headers = {"Authorization": f"Bearer {settings.TRACKER_API_TOKEN}"}
+    url = "/api/tickets/"
     params: dict[str, str] = {"date": target_date}
 
-    response = httpx.get(url, params=params, headers=headers, timeout=10)
+    response = _get_client().get(url, params=params)
 
     if response.status_code != 200:
         raise TrackerAPIError(response.status_code, response.text)
@@ -282,20 +339,21 @@ def get_tickets_by_date(target_date: str) -> list[dict]:
     return filtered if filtered else tickets
 
 
+@cache.cached(ttl=60)
 def get_sprints() -> list[dict]:
     """Fetch all sprints from the Tracker API.
 
     Returns:
-        A list of sprint dicts (each with id, name, status, start_date, end_date).
+        A list of sprint dicts (each with id, name, status, start_date, end_date),
+        as the tracker returned them. Compare statuses via :func:`sprint_status`.
 
     Raises:
         TrackerAPIError: If the API returns a non-2xx status.
         httpx.ConnectError: If the tracker is unreachable.
     """
-    url = f"{settings.TRACKER_API_URL}/api/sprints/"
-    headers = {"Authorization": f"Bearer {settings.TRACKER_API_TOKEN}"}
+    url = "/api/sprints/"
 
-    response = httpx.get(url, headers=headers, timeout=10)
+    response = _get_client().get(url)
 
     if response.status_code != 200:
         raise TrackerAPIError(response.status_code, response.text)
@@ -304,11 +362,26 @@ def get_sprints() -> list[dict]:
     return data.get("sprints", data)
 
 
-def get_sprint_tickets(sprint_id: int | str) -> list[dict]:
-    """Fetch all tickets for a specific sprint.
+def sprint_status(sprint: dict) -> str:
+    """Return *sprint*'s status lowercased (the tracker's casing varies)."""
+    return (sprint.get("status") or "").lower()
+
+
+def get_sprint_tickets(
+    sprint_id: int | str,
+    statuses: Collection[str] | None = None,
+    exclude_statuses: Collection[str] | None = None,
+) -> list[dict]:
+    """Fetch tickets for a specific sprint, optionally filtered by status.
+
+    Status filters are sent to the tracker as ``status__in`` /
+    ``status__nin`` so it can skip unwanted rows, and re-applied here so the
+    result is correct even if the tracker ignores them.
 
     Args:
         sprint_id: The sprint identifier.
+        statuses: If given, only return tickets with one of these statuses.
+        exclude_statuses: If given, drop tickets with any of these statuses.
 
     Returns:
         A list of ticket dicts for the given sprint.
@@ -317,17 +390,55 @@ def get_sprint_tickets(sprint_id: int | str) -> list[dict]:
         TrackerAPIError: If the API returns a non-2xx status.
         httpx.ConnectError: If the tracker is unreachable.
     """
-    url = f"{settings.TRACKER_API_URL}/api/tickets/"
-    headers = {"Authorization": f"Bearer {settings.TRACKER_API_TOKEN}"}
+    url = "/api/tickets/"
     params = {"sprint": str(sprint_id)}
+    if statuses is not None:
+        params["status__in"] = ",".join(sorted(statuses))
+    if exclude_statuses is not None:
+        params["status__nin"] = ",".join(sorted(exclude_statuses))
 
-    response = httpx.get(url, params=params, headers=headers, timeout=10)
+    response = _get_client().get(url, params=params)
 
     if response.status_code != 200:
         raise TrackerAPIError(response.status_code, response.text)
 
     data = response.json()
-    return data.get("tickets", data)
+    tickets = data.get("tickets", data)
+    if statuses is not None:
+        tickets = [t for t in tickets if t.get("status") in statuses]
+    if exclude_statuses is not None:
+        tickets = [t for t in tickets if t.get("status") not in exclude_statuses]
+    return tickets
+
+
+def get_active_sprint_with_tickets(
+    statuses: Collection[str] | None = None,
+    exclude_statuses: Collection[str] | None = None,
+) -> tuple[dict | None, list[dict]]:
+    """Fetch the active sprint together with its tickets.
+
+    The tracker has no endpoint that embeds tickets in sprints, so this is
+    still two requests over the shared keep-alive client; it exists so the
+    cron commands share one lookup instead of each repeating it.
+
+    Args:
+        statuses: Passed through to :func:`get_sprint_tickets`.
+        exclude_statuses: Passed through to :func:`get_sprint_tickets`.
+
+    Returns:
+        A ``(sprint, tickets)`` tuple. ``sprint`` is None (and ``tickets``
+        empty) when no sprint is active.
+
+    Raises:
+        TrackerAPIError: If the API returns a non-2xx status.
+        httpx.ConnectError: If the tracker is unreachable.
+    """
+    active = next((s for s in get_sprints() if sprint_status(s) == "active"), None)
+    if active is None:
+        return None, []
+    return active, get_sprint_tickets(
+        active["id"], statuses=statuses, exclude_statuses=exclude_statuses,
+    )
 
 
 def update_ticket(
@@ -350,16 +461,16 @@ def update_ticket(
         TrackerAPIError: If the API returns a non-2xx status.
         httpx.ConnectError: If the tracker is unreachable.
     """
-    url = f"{settings.TRACKER_API_URL}/api/tickets/{ticket_id}/"
-    headers = {"Authorization": f"Bearer {settings.TRACKER_API_TOKEN}"}
+    url = f"/api/tickets/{ticket_id}/"
     payload = dict(fields)
     if slack_user_id:
         payload["slack_user_id"] = slack_user_id
 
-    response = httpx.put(url, json=payload, headers=headers, timeout=10)
+    response = _get_client().put(url, json=payload)
 
     if response.status_code != 200:
         raise TrackerAPIError(response.status_code, response.text)
+    invalidate_cache()
 
     return response.json()
 
@@ -374,10 +485,9 @@ def get_slack_mappings() -> dict[str, str]:
         TrackerAPIError: If the API returns a non-2xx status.
         httpx.ConnectError: If the tracker is unreachable.
     """
-    url = f"{settings.TRACKER_API_URL}/api/slack-mappings/"
-    headers = {"Authorization": f"Bearer {settings.TRACKER_API_TOKEN}"}
+    url = "/api/slack-mappings/"
 
-    response = httpx.get(url, headers=headers, timeout=10)
+    response = _get_client().get(url)
 
     if response.status_code != 200:
         raise TrackerAPIError(response.status_code, response.text)
@@ -5,6 +5,7 @@ Usage:
     python scripts/build_fssai_index.py                                        # defaults
     python scripts/build_fssai_index.py --data data/sherpa_rag_dataset.jsonl   # custom file
     python scripts/build_fssai_index.py --index-dir faiss_index                # custom output
+    python scripts/build_fssai_index.py --index-type hnsw                      # approximate (HNSW) index
 
 Supports:
     - .jsonl  (one JSON object per line — expects "text" field)
@@ -24,6 +25,8 @@ from sentence_transformers import SentenceTransformer
 
 MODEL_NAME = "all-MiniLM-L6-v2"
 BATCH_SIZE = 64
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
 INDEX_FILENAME = "sherpa.index"
 METADATA_FILENAME = "sherpa_metadata.json"
 
@@ -66,6 +69,20 @@ def extract_text(doc: dict) -> str:
     return " — ".join(parts) if parts else ""
 
 
+def new_index(dimension: int, index_type: str) -> faiss.Index:
+    """Create an empty FAISS index of the requested type.
+
+    Embeddings are unit-normalized, so inner product equals cosine
+    similarity and skips the L2 norm terms. ``hnsw`` trades exact search
+    for sub-linear query time on large corpora.
+    """
+    if index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dimension, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        return index
+    return faiss.IndexFlatIP(dimension)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Build FAISS index from Sherpa RAG dataset")
     parser.add_argument(
@@ -80,6 +97,12 @@ def main():
         default=Path("faiss_index"),
         help="Output directory for FAISS index (default: faiss_index)",
     )
+    parser.add_argument(
+        "--index-type",
+        choices=("flat", "hnsw"),
+        default="flat",
+        help="FAISS index type for a new index: exact 'flat' or approximate 'hnsw' (default: flat)",
+    )
     parser.add_argument(
         "--model",
         type=str,
@@ -112,15 +135,17 @@ def main():
     model = SentenceTransformer(args.model)
 
     print(f"Generating embeddings for {len(texts)} documents...")
-    embeddings = model.encode(texts, batch_size=BATCH_SIZE, show_progress_bar=True)
-    embeddings = np.array(embeddings, dtype="float32")
+    embeddings = model.encode(
+        texts, batch_size=BATCH_SIZE, show_progress_bar=True, normalize_embeddings=True,
+    )
+    embeddings = np.asarray(embeddings, dtype="float32")
     print(f"  Embedding shape: {embeddings.shape}")
 
     # ── 3. Build FAISS index ──────────────────────────────────────
     dimension = embeddings.shape[1]
-    index = faiss.IndexFlatL2(dimension)
+    index = new_index(dimension, args.index_type)
     index.add(embeddings)
-    print(f"  FAISS index built — {index.ntotal} vectors, dim={dimension}")
+    print(f"  FAISS {args.index_type} index built — {index.ntotal} vectors, dim={dimension}")
 
     # ── 4. Save index + metadata ──────────────────────────────────
     args.index_dir.mkdir(parents=True, exist_ok=True)
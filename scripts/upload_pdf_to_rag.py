@@ -23,6 +23,8 @@ from sentence_transformers import SentenceTransformer
 
 MODEL_NAME = "all-MiniLM-L6-v2"
 BATCH_SIZE = 64
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
 INDEX_FILENAME = "sherpa.index"
 METADATA_FILENAME = "sherpa_metadata.json"
 
@@ -112,6 +114,20 @@ def process_pdf(pdf_path: Path, chunk_size: int, overlap: int) -> list[dict]:
     return documents
 
 
+def new_index(dimension: int, index_type: str) -> faiss.Index:
+    """Create an empty FAISS index of the requested type.
+
+    Embeddings are unit-normalized, so inner product equals cosine
+    similarity and skips the L2 norm terms. ``hnsw`` trades exact search
+    for sub-linear query time on large corpora.
+    """
+    if index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dimension, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        return index
+    return faiss.IndexFlatIP(dimension)
+
+
 def load_existing_index(index_dir: Path):
     """Load existing FAISS index and metadata, or return None."""
     index_path = index_dir / INDEX_FILENAME
@@ -153,6 +169,12 @@ def main():
         default=100,
         help="Character overlap between chunks (default: 100)",
     )
+    parser.add_argument(
+        "--index-type",
+        choices=("flat", "hnsw"),
+        default="flat",
+        help="FAISS index type for a new index: exact 'flat' or approximate 'hnsw' (default: flat)",
+    )
     parser.add_argument(
         "--model",
         type=str,
@@ -194,8 +216,10 @@ def main():
     model = SentenceTransformer(args.model)
 
     print(f"Generating embeddings for {len(texts)} chunks...")
-    embeddings = model.encode(texts, batch_size=BATCH_SIZE, show_progress_bar=True)
-    embeddings = np.array(embeddings, dtype="float32")
+    embeddings = model.encode(
+        texts, batch_size=BATCH_SIZE, show_progress_bar=True, normalize_embeddings=True,
+    )
+    embeddings = np.asarray(embeddings, dtype="float32")
     print(f"  Embedding shape: {embeddings.shape}")
 
     # ── 4. Update or create FAISS index ───────────────────────────
@@ -217,7 +241,7 @@ def main():
         print("\nCreating new index...")
         start_idx = 0
         dimension = embeddings.shape[1]
-        index = faiss.IndexFlatL2(dimension)
+        index = new_index(dimension, args.index_type)
         index.add(embeddings)
         metadata = []
 